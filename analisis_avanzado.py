@@ -1,45 +1,474 @@
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
-from datetime import datetime, timedelta
-from scipy import stats
+from pathlib import Path
+
+try:
+    from numba import njit
+except ImportError:  # numba es opcional; sin él se usa la versión NumPy
+    njit = None
+
+# Resolución de los PNG del reporte; las ejecuciones interactivas, que además
+# muestran la gráfica en pantalla, guardan a menos resolución
+DPI_GRAFICAS = 300
+DPI_INTERACTIVO = 150
+# Compresión zlib baja: la codificación PNG domina el tiempo de savefig
+OPCIONES_PNG = {'compress_level': 1}
+# Sin el bloque tEXt 'Software' que matplotlib añade a cada PNG
+METADATOS_PNG = {'Software': None}
+SEP50 = "=" * 50
+SEP60 = "=" * 60
+TAMANO_BLOQUE = 500_000
+ESQUEMA_CSV = {
+    'ventas': 'float64',
+    # Puede venir vacía: se lee como float y pasa a int32 tras quitar esas filas
+    'cantidad': 'float64',
+    'categoria': 'category',
+    'region': 'category',
+    'producto': 'category',
+}
+DIAS_SEMANA = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# Bits altos de cada venta que forman su casilla en el histograma del modo streaming
+BITS_HISTOGRAMA = 20
+# Casillas con más ventas que esto no se cargan: se subdividen con otra relectura
+MAX_VALORES_CASILLA = TAMANO_BLOQUE
+
+
+def _fast_linregress(y, calcular_p=False):
+    """Regresión lineal de y contra x = 0..n-1 con fórmulas cerradas"""
+    n = len(y)
+    if n < 2:
+        raise ValueError("Se necesitan al menos dos días para calcular la tendencia")
+    x = np.arange(n)
+    sx = n * (n - 1) / 2
+    sxx = n * (n - 1) * (2 * n - 1) / 6
+    sy = y.sum()
+    sxy = (x * y).sum()
+    
+    slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    intercept = (sy - slope * sx) / n
+    
+    ss_res = ((y - (slope * x + intercept)) ** 2).sum()
+    ss_tot = ((y - y.mean()) ** 2).sum()
+    r2 = 1 - ss_res / ss_tot if ss_tot > 0 else 0.0
+    
+    if not calcular_p:
+        return slope, intercept, r2
+    
+    # El valor p sólo se calcula cuando se necesita (prueba t de la pendiente)
+    gl = n - 2
+    if gl <= 0 or r2 >= 1:
+        # Con dos puntos el ajuste es exacto y no quedan grados de libertad
+        p_value = 0.0
+    else:
+        # scipy.stats es de carga lenta y sólo hace falta para este contraste
+        from scipy import stats
+        
+        t = np.sqrt(r2 * gl / (1 - r2))
+        p_value = 2 * stats.t.sf(t, gl)
+    return slope, intercept, r2, p_value
+
+
+def _corrcoef_float32(M):
+    """Matriz de correlación de Pearson de las filas de M sin pasar a float64"""
+    # np.corrcoef promueve siempre a float64; aquí el centrado y el producto
+    # matricial se quedan en float32 (sgemm), suficiente para 4 decimales
+    M = M.astype(np.float32, copy=False)
+    M = M - M.mean(axis=1, keepdims=True)
+    normas = np.linalg.norm(M, axis=1)
+    C = (M @ M.T) / np.outer(normas, normas)
+    return np.clip(C, -1, 1)
+
+
+def _claves_ventas(ventas):
+    """Clave entera de cada venta que se ordena igual que los valores"""
+    # Los bits de un float64 se convierten en un entero con el mismo orden:
+    # negativos invertidos, positivos con el bit de signo puesto
+    bits = np.ascontiguousarray(ventas, dtype=np.float64).view(np.uint64)
+    return np.where(bits >> np.uint64(63), ~bits, bits | np.uint64(1 << 63))
+
+
+def _valor_de_clave(clave):
+    """Venta que corresponde a una clave de _claves_ventas"""
+    clave = np.array([clave], dtype=np.uint64)
+    bits = np.where(clave >> np.uint64(63), clave ^ np.uint64(1 << 63), ~clave)
+    return float(bits.view(np.float64)[0])
+
+
+def _casillas_ventas(ventas):
+    """Casilla de histograma de cada venta, en el mismo orden que los valores"""
+    # La casilla son los bits más altos de la clave: no hace falta conocer el
+    # rango de antemano
+    return (_claves_ventas(ventas) >> np.uint64(64 - BITS_HISTOGRAMA)).astype(np.int64)
+
+
+def _lerp(a, b, t):
+    """Interpolación lineal con el mismo redondeo que np.quantile"""
+    return b - (b - a) * (1 - t) if t >= 0.5 else a + (b - a) * t
+
+
+def _agregar_y_outliers_numpy(codigos, ventas, lower_bound, upper_bound, n_dias):
+    """Totales diarios, índices de outliers y rango de las demás ventas con NumPy"""
+    # factorize marca las fechas faltantes con -1; las ventas faltantes no
+    # suman, como en groupby().sum()
+    validos = (codigos >= 0) & np.isfinite(ventas)
+    totales = np.bincount(codigos[validos], weights=ventas[validos], minlength=n_dias)
+    indices = np.flatnonzero((ventas < lower_bound) | (ventas > upper_bound))
+    dentro = ventas[(ventas >= lower_bound) & (ventas <= upper_bound)]
+    if dentro.size == 0:
+        return totales, indices, np.inf, -np.inf
+    return totales, indices, dentro.min(), dentro.max()
+
+
+def _agregar_y_outliers_loop(codigos, ventas, lower_bound, upper_bound, n_dias):
+    """Totales diarios, índices de outliers y rango de las demás ventas en una sola pasada"""
+    totales = np.zeros(n_dias)
+    indices = np.empty(ventas.size, np.int64)
+    k = 0
+    # Extremos de los bigotes del boxplot: menor y mayor venta dentro de los límites
+    minimo, maximo = np.inf, -np.inf
+    for i in range(ventas.size):
+        v = ventas[i]
+        if codigos[i] >= 0 and np.isfinite(v):
+            totales[codigos[i]] += v
+        if v < lower_bound or v > upper_bound:
+            indices[k] = i
+            k += 1
+        elif v >= lower_bound:  # falso para las ventas faltantes
+            minimo = min(minimo, v)
+            maximo = max(maximo, v)
+    return totales, indices[:k], minimo, maximo
+
+
+if njit is not None:
+    _agregar_y_outliers = njit(cache=True)(_agregar_y_outliers_loop)
+else:
+    _agregar_y_outliers = _agregar_y_outliers_numpy
+
 
 class AnalizadorAvanzado:
-    def __init__(self, archivo_datos):
+    def __init__(self, archivo_datos, modo_streaming=False, dpi=DPI_GRAFICAS):
         """Inicializar el analizador avanzado"""
         self.archivo_datos = archivo_datos
+        self.modo_streaming = modo_streaming
+        self.dpi = dpi
         self.datos = None
-        self.cargar_datos()
+        self._ventas_diarias = None
+        self._ventas_dia_semana = None
+        self._ventas = None
+        self._limites_outliers = None
+        self._indices_outliers = None
+        self._extremos_dentro = None
+        self._histograma_ventas = None
+        self._mediana = None
+        # Una sola figura reutilizada por todas las gráficas del analizador
+        self._fig, self._axes = plt.subplots(figsize=(12, 6))
+        if modo_streaming:
+            self.cargar_agregados_streaming()
+        else:
+            self.cargar_datos()
     
     def cargar_datos(self):
-        """Cargar y preparar los datos"""
+        """Cargar y preparar los datos (usa la caché Arrow si está al día)"""
         try:
-            self.datos = pd.read_csv(self.archivo_datos)
-            self.datos['fecha'] = pd.to_datetime(self.datos['fecha'])
-            self.datos['dia_semana'] = self.datos['fecha'].dt.day_name()
-            self.datos['mes'] = self.datos['fecha'].dt.month
+            ruta_csv = Path(self.archivo_datos)
+            ruta_cache = ruta_csv.with_suffix('.arrow')
+            
+            if ruta_cache.exists() and ruta_cache.stat().st_mtime > ruta_csv.stat().st_mtime:
+                self.datos = self._leer_cache(ruta_cache)
+                self._preparar_columnas()
+            else:
+                self.datos = self._leer_csv(ruta_csv)
+                self._preparar_columnas()
+                self._guardar_cache(ruta_cache)
+            
+            self._ventas_diarias = None
+            self._ventas_dia_semana = None
+            self._ventas = None
+            self._limites_outliers = None
+            self._indices_outliers = None
+            self._extremos_dentro = None
+            self._mediana = None
             print(f"✅ Datos cargados exitosamente: {len(self.datos)} registros")
         except Exception as e:
             print(f"❌ Error al cargar datos: {e}")
     
-    def analizar_tendencias(self):
+    def __del__(self):
+        """Liberar la figura compartida"""
+        if getattr(self, '_fig', None) is not None:
+            plt.close(self._fig)
+    
+    def _limpiar_figura(self):
+        """Dejar la figura compartida vacía para la siguiente gráfica"""
+        # Se conserva la figura pero los ejes se crean de nuevo: limpiar los
+        # anteriores arrastraría estado de la gráfica previa (el heatmap quita
+        # los bordes, deja el eje cuadrado y añade la barra de color)
+        self._fig.clear()
+        self._axes = self._fig.add_subplot()
+    
+    def _preparar_figura(self, figsize):
+        """Limpiar la figura compartida y ajustarla al tamaño pedido"""
+        self._limpiar_figura()
+        self._fig.set_size_inches(figsize)
+        return self._axes
+    
+    def _guardar_figura(self, nombre_archivo, mostrar):
+        """Guardar la figura compartida, mostrarla si se pide y dejarla vacía"""
+        self._fig.tight_layout()
+        dpi = DPI_INTERACTIVO if mostrar else self.dpi
+        self._fig.savefig(nombre_archivo, dpi=dpi, metadata=METADATOS_PNG, pil_kwargs=OPCIONES_PNG)
+        if mostrar:
+            plt.show()
+        self._limpiar_figura()
+    
+    def cargar_agregados_streaming(self):
+        """Leer el CSV por bloques acumulando sólo los agregados necesarios"""
+        try:
+            diarias = pd.Series(dtype='float64')
+            dia_semana = np.zeros(7)
+            # Para los cuartiles basta un histograma de tamaño fijo: la memoria no
+            # crece con el archivo
+            histograma = np.zeros(1 << BITS_HISTOGRAMA, dtype=np.int64)
+            registros = 0
+            
+            for chunk in pd.read_csv(self.archivo_datos, chunksize=TAMANO_BLOQUE,
+                                     parse_dates=['fecha'], dtype=ESQUEMA_CSV):
+                ventas = chunk['ventas'].to_numpy()
+                diarias = diarias.add(chunk.groupby('fecha', sort=False)['ventas'].sum(), fill_value=0)
+                # Las filas sin fecha válida no tienen día de la semana y las
+                # ventas faltantes no suman
+                validas = chunk['fecha'].notna().to_numpy() & np.isfinite(ventas)
+                dias = chunk['fecha'].dt.dayofweek.to_numpy()[validas].astype(np.int8)
+                dia_semana += np.bincount(dias, weights=ventas[validas], minlength=7)
+                # Los cuartiles ignoran las ventas faltantes, como Series.quantile
+                histograma += np.bincount(_casillas_ventas(ventas[~np.isnan(ventas)]),
+                                          minlength=histograma.size)
+                registros += len(chunk)
+            
+            diarias = diarias.sort_index()
+            self._ventas_diarias = pd.DataFrame({'fecha': diarias.index, 'ventas': diarias.to_numpy()})
+            self._ventas_dia_semana = pd.Series(dia_semana, index=DIAS_SEMANA)
+            self._histograma_ventas = histograma
+            print(f"✅ Datos agregados por bloques: {registros} registros")
+        except Exception as e:
+            print(f"❌ Error al cargar datos: {e}")
+    
+    def _cuartiles_streaming(self):
+        """Q1, mediana y Q3 exactos a partir del histograma y relecturas del CSV"""
+        # El histograma no cuenta las ventas faltantes: los cuartiles las ignoran
+        n = int(self._histograma_ventas.sum())
+        if n == 0:
+            return np.nan, np.nan, np.nan
+        
+        # Posiciones (en orden) de los valores que intervienen en cada cuantil
+        indices = {q: (n - 1) * q for q in (0.25, 0.5, 0.75)}
+        rangos = sorted({r for h in indices.values() for r in (int(h), min(int(h) + 1, n - 1))})
+        estadistico = self._estadisticos_de_orden(rangos)
+        
+        def vecinos(q):
+            h = indices[q]
+            return estadistico[int(h)], estadistico[min(int(h) + 1, n - 1)], h - int(h)
+        
+        q1 = _lerp(*vecinos(0.25))
+        q3 = _lerp(*vecinos(0.75))
+        # La mediana se calcula como np.median: media de los dos valores centrales
+        a, b, t = vecinos(0.5)
+        mediana = (a + b) / 2 if t else a
+        return q1, mediana, q3
+    
+    def _estadisticos_de_orden(self, rangos):
+        """Ventas que ocupan las posiciones rangos (0 = menor) releyendo el CSV por bloques"""
+        # Cada posición se sigue dentro de su casilla, identificada por un prefijo
+        # de la clave: (prefijo, bits) -> (ventas en la casilla, [(rango, posición en ella)])
+        pendientes = {}
+        self._ubicar_rangos(pendientes, 0, BITS_HISTOGRAMA, self._histograma_ventas, [(r, r) for r in rangos])
+        
+        resultado = {}
+        while pendientes:
+            # Las casillas pequeñas se cargan y se ordenan parcialmente; las
+            # grandes (p. ej. un precio muy repetido) se subdividen con un
+            # histograma de los bits siguientes, así que la memoria está acotada
+            cargar, dividir = {}, {}
+            for (prefijo, bits), (tamano, posiciones) in pendientes.items():
+                if bits == 64:
+                    # Prefijo completo: todas las ventas de la casilla son iguales
+                    for r, _ in posiciones:
+                        resultado[r] = _valor_de_clave(prefijo)
+                elif tamano <= MAX_VALORES_CASILLA:
+                    cargar[(prefijo, bits)] = ([], posiciones)
+                else:
+                    paso = min(BITS_HISTOGRAMA, 64 - bits)
+                    dividir[(prefijo, bits)] = (np.zeros(1 << paso, dtype=np.int64), paso, posiciones)
+            if not cargar and not dividir:
+                break
+            
+            for chunk in pd.read_csv(self.archivo_datos, chunksize=TAMANO_BLOQUE, usecols=['ventas']):
+                ventas = chunk['ventas'].to_numpy(dtype=np.float64)
+                claves = _claves_ventas(ventas[~np.isnan(ventas)])
+                for (prefijo, bits), (partes, _) in cargar.items():
+                    partes.append(claves[(claves >> np.uint64(64 - bits)) == np.uint64(prefijo)])
+                for (prefijo, bits), (histograma, paso, _) in dividir.items():
+                    dentro = claves[(claves >> np.uint64(64 - bits)) == np.uint64(prefijo)]
+                    sub = (dentro >> np.uint64(64 - bits - paso)) & np.uint64((1 << paso) - 1)
+                    histograma += np.bincount(sub.astype(np.int64), minlength=histograma.size)
+            
+            for partes, posiciones in cargar.values():
+                claves = np.partition(np.concatenate(partes), [p for _, p in posiciones])
+                for r, p in posiciones:
+                    resultado[r] = _valor_de_clave(claves[p])
+            pendientes = {}
+            for (prefijo, bits), (histograma, paso, posiciones) in dividir.items():
+                self._ubicar_rangos(pendientes, prefijo << paso, bits + paso, histograma, posiciones)
+        return resultado
+    
+    @staticmethod
+    def _ubicar_rangos(pendientes, base, bits, histograma, posiciones):
+        """Asignar cada posición a la casilla del histograma que la contiene"""
+        acumulado = np.cumsum(histograma)
+        for r, p in posiciones:
+            c = int(np.searchsorted(acumulado, p, side='right'))
+            inicio = int(acumulado[c] - histograma[c])
+            pendientes.setdefault((base | c, bits), (int(histograma[c]), []))[1].append((r, p - inicio))
+    
+    def _outliers_streaming(self, lower_bound, upper_bound):
+        """Recorrer de nuevo el CSV por bloques y quedarse con los outliers y el rango del resto"""
+        encontrados = []
+        minimo, maximo = np.inf, -np.inf
+        for chunk in pd.read_csv(self.archivo_datos, chunksize=TAMANO_BLOQUE,
+                                 usecols=['fecha', 'producto', 'ventas'], parse_dates=['fecha']):
+            ventas = chunk['ventas'].to_numpy()
+            fuera = (ventas < lower_bound) | (ventas > upper_bound)
+            encontrados.append(chunk[fuera])
+            # Las ventas faltantes no están ni dentro ni fuera de los límites
+            dentro = ventas[(ventas >= lower_bound) & (ventas <= upper_bound)]
+            if dentro.size:
+                minimo = min(minimo, dentro.min())
+                maximo = max(maximo, dentro.max())
+        return pd.concat(encontrados, ignore_index=True), minimo, maximo
+    
+    def _leer_csv(self, ruta_csv):
+        """Leer el CSV con esquema declarado usando el lector multihilo de pyarrow"""
+        opciones = dict(parse_dates=['fecha'], dtype=ESQUEMA_CSV)
+        try:
+            datos = pd.read_csv(ruta_csv, engine='pyarrow', **opciones)
+        except ImportError:
+            datos = pd.read_csv(ruta_csv, **opciones)
+        return self._limpiar_cantidad(datos)
+    
+    @staticmethod
+    def _limpiar_cantidad(datos):
+        """Quitar las filas sin cantidad y guardarla como int32 si son enteras"""
+        sin_cantidad = datos['cantidad'].isna().to_numpy()
+        if sin_cantidad.any():
+            print(f"⚠️ Se descartaron {int(sin_cantidad.sum())} filas sin cantidad")
+            datos = datos.loc[~sin_cantidad].reset_index(drop=True)
+        cantidad = datos['cantidad'].to_numpy()
+        if (np.isfinite(cantidad).all() and (cantidad == np.floor(cantidad)).all()
+                and (cantidad.size == 0 or (cantidad.min() >= -2**31 and cantidad.max() < 2**31))):
+            datos = datos.assign(cantidad=cantidad.astype(np.int32))
+        return datos
+    
+    def _preparar_columnas(self):
+        """Asegurar columnas categóricas y agregar los campos temporales que falten"""
+        for c in ('categoria', 'region', 'producto'):
+            if not isinstance(self.datos[c].dtype, pd.CategoricalDtype):
+                self.datos[c] = self.datos[c].astype('category')
+        if 'dow' not in self.datos.columns:
+            # -1 para las filas sin fecha válida, que no cuentan en ningún día
+            self.datos['dow'] = self.datos['fecha'].dt.dayofweek.fillna(-1).astype('int8')
+        if 'mes' not in self.datos.columns:
+            self.datos['mes'] = self.datos['fecha'].dt.month
+    
+    def _leer_cache(self, ruta_cache):
+        """Abrir la caché Arrow IPC mapeada en memoria, sin volver a parsear"""
+        import pyarrow as pa
+        
+        with pa.memory_map(str(ruta_cache)) as mm:
+            tabla = pa.ipc.open_file(mm).read_all()
+        return tabla.to_pandas(zero_copy_only=False)
+    
+    def _guardar_cache(self, ruta_cache):
+        """Guardar los datos ya procesados junto al CSV en formato Arrow IPC"""
+        try:
+            import pyarrow as pa
+            
+            # Sin compresión, para que los procesos hijos puedan mapear el archivo
+            tabla = pa.Table.from_pandas(self.datos, preserve_index=False)
+            with pa.OSFile(str(ruta_cache), 'wb') as f:
+                with pa.ipc.new_file(f, tabla.schema) as writer:
+                    writer.write_table(tabla)
+        except (ImportError, OSError) as e:
+            print(f"⚠️ No se pudo guardar la caché Arrow: {e}")
+    
+    def _get_ventas_diarias(self):
+        """Obtener las ventas diarias, calculándolas una sola vez"""
+        if self._ventas_diarias is None:
+            self._precalcular_agregados()
+        return self._ventas_diarias
+    
+    def _precalcular_agregados(self):
+        """Calcular juntos los totales diarios, los outliers y el rango del resto de ventas"""
+        # factorize + una pasada entera en lugar de un groupby por hash y otra para la máscara
+        codigos, fechas = pd.factorize(self.datos['fecha'], sort=True)
+        _, _, _, lower_bound, upper_bound = self._get_limites_outliers()
+        totales, indices, minimo, maximo = _agregar_y_outliers(
+            codigos, self._get_ventas(), lower_bound, upper_bound, len(fechas)
+        )
+        self._ventas_diarias = pd.DataFrame({'fecha': fechas, 'ventas': totales})
+        self._indices_outliers = indices
+        self._extremos_dentro = (minimo, maximo)
+    
+    def _get_limites_outliers(self):
+        """Obtener Q1, Q3, IQR y los límites de outliers de las ventas (y guardar la mediana)"""
+        if self._limites_outliers is None:
+            if self.modo_streaming:
+                Q1, self._mediana, Q3 = self._cuartiles_streaming()
+            else:
+                # Cuartiles y mediana en una sola llamada sobre el arreglo; como
+                # Series.quantile, las ventas faltantes no cuentan
+                Q1, self._mediana, Q3 = np.nanquantile(self._get_ventas(), [0.25, 0.5, 0.75])
+            IQR = Q3 - Q1
+            self._limites_outliers = (Q1, Q3, IQR, Q1 - 1.5 * IQR, Q3 + 1.5 * IQR)
+        return self._limites_outliers
+    
+    def _get_ventas_dia_semana(self):
+        """Obtener ventas por día de la semana (una pasada sobre los códigos 0=lunes..6=domingo)"""
+        if self._ventas_dia_semana is None:
+            dow = self.datos['dow'].to_numpy()
+            ventas = self._get_ventas()
+            # Sin las filas sin fecha ni las ventas faltantes, como groupby().sum()
+            validas = (dow >= 0) & np.isfinite(ventas)
+            totales = np.bincount(dow[validas], weights=ventas[validas], minlength=7)
+            self._ventas_dia_semana = pd.Series(totales, index=DIAS_SEMANA)
+        return self._ventas_dia_semana
+    
+    def _get_ventas(self):
+        """Obtener la columna de ventas como arreglo NumPy"""
+        if self._ventas is None:
+            self._ventas = self.datos['ventas'].to_numpy(dtype=np.float64)
+        return self._ventas
+    
+    def analizar_tendencias(self, mostrar=False):
         """Analizar tendencias en las ventas"""
-        print("\n" + "="*50)
-        print("📈 ANÁLISIS DE TENDENCIAS")
-        print("="*50)
+        print(f"\n{SEP50}\n📈 ANÁLISIS DE TENDENCIAS\n{SEP50}")
         
         # Agrupar por fecha y calcular ventas diarias
-        ventas_diarias = self.datos.groupby('fecha')['ventas'].sum().reset_index()
+        ventas_diarias = self._get_ventas_diarias()
         
         # Calcular tendencia lineal
         x = np.arange(len(ventas_diarias))
         y = ventas_diarias['ventas'].values
         
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+        slope, intercept, r2, p_value = _fast_linregress(y, calcular_p=True)
         
         print(f"Pendiente de la tendencia: {slope:.2f}")
-        print(f"Coeficiente de correlación (R²): {r_value**2:.4f}")
+        print(f"Coeficiente de correlación (R²): {r2:.4f}")
         print(f"Valor p: {p_value:.4f}")
         
         if slope > 0:
@@ -50,101 +479,106 @@ class AnalizadorAvanzado:
             print("➡️ Tendencia: ESTABLE")
         
         # Graficar tendencia
-        plt.figure(figsize=(12, 6))
-        plt.plot(ventas_diarias['fecha'], ventas_diarias['ventas'], 
+        ax = self._preparar_figura((12, 6))
+        ax.plot(ventas_diarias['fecha'], ventas_diarias['ventas'], 
                 marker='o', linewidth=2, markersize=6, label='Ventas reales')
         
         # Línea de tendencia
         trend_line = slope * x + intercept
-        plt.plot(ventas_diarias['fecha'], trend_line, 'r--', linewidth=2, label='Tendencia')
+        ax.plot(ventas_diarias['fecha'], trend_line, 'r--', linewidth=2, label='Tendencia')
         
-        plt.title('Análisis de Tendencia de Ventas', fontsize=16, fontweight='bold')
-        plt.xlabel('Fecha', fontsize=12)
-        plt.ylabel('Ventas ($)', fontsize=12)
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
+        ax.set_title('Análisis de Tendencia de Ventas', fontsize=16, fontweight='bold')
+        ax.set_xlabel('Fecha', fontsize=12)
+        ax.set_ylabel('Ventas ($)', fontsize=12)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(axis='x', rotation=45)
         
-        plt.tight_layout()
-        plt.savefig('tendencia_ventas.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self._guardar_figura('tendencia_ventas.png', mostrar)
     
-    def analizar_estacionalidad(self):
+    def analizar_estacionalidad(self, mostrar=False):
         """Analizar patrones estacionales"""
-        print("\n" + "="*50)
-        print("📅 ANÁLISIS DE ESTACIONALIDAD")
-        print("="*50)
+        print(f"\n{SEP50}\n📅 ANÁLISIS DE ESTACIONALIDAD\n{SEP50}")
         
-        # Ventas por día de la semana
-        ventas_dia = self.datos.groupby('dia_semana')['ventas'].sum().reindex([
-            'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'
-        ])
+        ventas_dia = self._get_ventas_dia_semana()
         
         print("Ventas por día de la semana:")
         for dia, venta in ventas_dia.items():
             print(f"  {dia}: ${venta:,.2f}")
         
         # Graficar estacionalidad semanal
-        plt.figure(figsize=(10, 6))
-        bars = plt.bar(ventas_dia.index, ventas_dia.values, color='lightgreen')
-        plt.title('Ventas por Día de la Semana', fontsize=16, fontweight='bold')
-        plt.xlabel('Día de la Semana', fontsize=12)
-        plt.ylabel('Ventas ($)', fontsize=12)
-        plt.xticks(rotation=45)
+        ax = self._preparar_figura((10, 6))
+        bars = ax.bar(ventas_dia.index, ventas_dia.values, color='lightgreen')
+        ax.set_title('Ventas por Día de la Semana', fontsize=16, fontweight='bold')
+        ax.set_xlabel('Día de la Semana', fontsize=12)
+        ax.set_ylabel('Ventas ($)', fontsize=12)
+        ax.tick_params(axis='x', rotation=45)
         
         # Agregar valores en las barras
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                    f'${height:,.0f}', ha='center', va='bottom', fontweight='bold')
+        ax.bar_label(bars, labels=[f'${v:,.0f}' for v in ventas_dia.values],
+                     padding=3, fontweight='bold')
         
-        plt.tight_layout()
-        plt.savefig('estacionalidad_semanal.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self._guardar_figura('estacionalidad_semanal.png', mostrar)
     
-    def analizar_correlaciones(self):
+    def analizar_correlaciones(self, mostrar=False):
         """Analizar correlaciones entre variables"""
-        print("\n" + "="*50)
-        print("🔗 ANÁLISIS DE CORRELACIONES")
-        print("="*50)
-        
-        # Crear variables numéricas para correlación
-        datos_corr = self.datos.copy()
-        datos_corr['categoria_num'] = pd.Categorical(datos_corr['categoria']).codes
-        datos_corr['region_num'] = pd.Categorical(datos_corr['region']).codes
-        
-        # Calcular correlaciones
-        correlaciones = datos_corr[['ventas', 'cantidad', 'categoria_num', 'region_num']].corr()
+        print(f"\n{SEP50}\n🔗 ANÁLISIS DE CORRELACIONES\n{SEP50}")
+        
+        if self.modo_streaming:
+            print("⚠️ Las correlaciones requieren los datos completos; no disponibles en modo streaming")
+            return
+        
+        # Construir directamente la matriz numérica, sin copiar todo el DataFrame
+        cols = {
+            'ventas': self.datos['ventas'].to_numpy(),
+            'cantidad': self.datos['cantidad'].to_numpy(),
+            'categoria_num': self.datos['categoria'].cat.codes.to_numpy(),
+            'region_num': self.datos['region'].cat.codes.to_numpy(),
+        }
+        
+        # Calcular correlaciones (una fila por variable)
+        M = np.vstack(list(cols.values()))
+        if np.isnan(M).any():
+            # Con ventas faltantes cada par usa sólo las filas con ambos valores,
+            # como DataFrame.corr; el atajo en float32 no sabe omitirlas
+            matriz = pd.DataFrame(M.T, columns=list(cols)).corr().to_numpy()
+        else:
+            matriz = _corrcoef_float32(M)
+        correlaciones = pd.DataFrame(matriz, index=list(cols), columns=list(cols))
         
         print("Matriz de correlaciones:")
         print(correlaciones)
         
-        # Graficar matriz de correlaciones
-        plt.figure(figsize=(8, 6))
+        # Graficar matriz de correlaciones (seaborn sólo se importa si se usa)
+        import seaborn as sns
+        
+        ax = self._preparar_figura((8, 6))
         sns.heatmap(correlaciones, annot=True, cmap='coolwarm', center=0, 
-                   square=True, linewidths=0.5)
-        plt.title('Matriz de Correlaciones', fontsize=16, fontweight='bold')
+                   square=True, linewidths=0.5, ax=ax)
+        ax.set_title('Matriz de Correlaciones', fontsize=16, fontweight='bold')
         
-        plt.tight_layout()
-        plt.savefig('correlaciones.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self._guardar_figura('correlaciones.png', mostrar)
     
-    def analizar_outliers(self):
+    def analizar_outliers(self, mostrar=False):
         """Detectar y analizar outliers en las ventas"""
-        print("\n" + "="*50)
-        print("🔍 ANÁLISIS DE OUTLIERS")
-        print("="*50)
-        
-        # Calcular estadísticas para detectar outliers
-        Q1 = self.datos['ventas'].quantile(0.25)
-        Q3 = self.datos['ventas'].quantile(0.75)
-        IQR = Q3 - Q1
+        print(f"\n{SEP50}\n🔍 ANÁLISIS DE OUTLIERS\n{SEP50}")
         
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+        Q1, Q3, IQR, lower_bound, upper_bound = self._get_limites_outliers()
         
-        outliers = self.datos[(self.datos['ventas'] < lower_bound) | 
-                             (self.datos['ventas'] > upper_bound)]
+        # Mediana, bigotes y puntos atípicos del boxplot; se reutilizan los
+        # cuartiles y la pasada de agregados en lugar de que matplotlib recorra
+        # de nuevo las ventas
+        if self.modo_streaming:
+            outliers, minimo, maximo = self._outliers_streaming(lower_bound, upper_bound)
+            fliers = outliers['ventas'].to_numpy()
+        else:
+            if self._indices_outliers is None:
+                self._precalcular_agregados()
+            outliers = self.datos.iloc[self._indices_outliers]
+            fliers = self._get_ventas()[self._indices_outliers]
+            minimo, maximo = self._extremos_dentro
+        mediana = self._mediana
+        hay_dentro = minimo <= maximo
         
         print(f"Límite inferior: ${lower_bound:.2f}")
         print(f"Límite superior: ${upper_bound:.2f}")
@@ -152,86 +586,120 @@ class AnalizadorAvanzado:
         
         if len(outliers) > 0:
             print("\nOutliers encontrados:")
-            for _, row in outliers.iterrows():
-                print(f"  {row['fecha'].strftime('%Y-%m-%d')} - {row['producto']}: ${row['ventas']:.2f}")
+            lineas = ('  ' + outliers['fecha'].dt.strftime('%Y-%m-%d').fillna('sin fecha')
+                      + ' - ' + outliers['producto'].astype(str)
+                      + ': $' + outliers['ventas'].map('{:.2f}'.format))
+            print('\n'.join(lineas))
         
         # Graficar boxplot
-        plt.figure(figsize=(10, 6))
-        plt.boxplot(self.datos['ventas'], patch_artist=True, 
-                   boxprops=dict(facecolor='lightblue'))
-        plt.title('Distribución de Ventas (Boxplot)', fontsize=16, fontweight='bold')
-        plt.ylabel('Ventas ($)', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        plt.savefig('outliers_ventas.png', dpi=300, bbox_inches='tight')
-        plt.show()
-    
-    def prediccion_simple(self):
+        ax = self._preparar_figura((10, 6))
+        stats_box = [{
+            'med': mediana,
+            'q1': Q1,
+            'q3': Q3,
+            'whislo': minimo if hay_dentro else Q1,
+            'whishi': maximo if hay_dentro else Q3,
+            'fliers': fliers,
+            'label': '1',
+        }]
+        ax.bxp(stats_box, patch_artist=True,
+               boxprops=dict(facecolor='lightblue'))
+        ax.set_title('Distribución de Ventas (Boxplot)', fontsize=16, fontweight='bold')
+        ax.set_ylabel('Ventas ($)', fontsize=12)
+        ax.grid(True, alpha=0.3)
+        
+        self._guardar_figura('outliers_ventas.png', mostrar)
+    
+    def prediccion_simple(self, mostrar=False):
         """Realizar predicción simple basada en tendencia"""
-        print("\n" + "="*50)
-        print("🔮 PREDICCIÓN SIMPLE")
-        print("="*50)
+        print(f"\n{SEP50}\n🔮 PREDICCIÓN SIMPLE\n{SEP50}")
         
         # Calcular tendencia
-        ventas_diarias = self.datos.groupby('fecha')['ventas'].sum().reset_index()
-        x = np.arange(len(ventas_diarias))
+        ventas_diarias = self._get_ventas_diarias()
         y = ventas_diarias['ventas'].values
         
-        slope, intercept, _, _, _ = stats.linregress(x, y)
+        slope, intercept, _ = _fast_linregress(y)
         
         # Predecir próximos 5 días
         ultima_fecha = ventas_diarias['fecha'].max()
-        predicciones = []
-        fechas_pred = []
-        
-        for i in range(1, 6):
-            fecha_pred = ultima_fecha + timedelta(days=i)
-            pred = slope * (len(ventas_diarias) + i - 1) + intercept
-            predicciones.append(max(0, pred))  # No ventas negativas
-            fechas_pred.append(fecha_pred)
+        i = np.arange(1, 6)
+        predicciones = np.clip(slope * (len(ventas_diarias) + i - 1) + intercept, 0, None)  # No ventas negativas
+        fechas_pred = pd.date_range(ultima_fecha + pd.Timedelta(days=1), periods=5, freq='D')
         
         print("Predicciones para los próximos 5 días:")
         for fecha, pred in zip(fechas_pred, predicciones):
             print(f"  {fecha.strftime('%Y-%m-%d')}: ${pred:.2f}")
         
         # Graficar predicciones
-        plt.figure(figsize=(12, 6))
-        plt.plot(ventas_diarias['fecha'], ventas_diarias['ventas'], 
+        ax = self._preparar_figura((12, 6))
+        ax.plot(ventas_diarias['fecha'], ventas_diarias['ventas'], 
                 marker='o', linewidth=2, markersize=6, label='Ventas reales')
-        plt.plot(fechas_pred, predicciones, 'r--', marker='s', 
+        ax.plot(fechas_pred, predicciones, 'r--', marker='s', 
                 linewidth=2, markersize=6, label='Predicciones')
         
-        plt.title('Predicción de Ventas (Próximos 5 días)', fontsize=16, fontweight='bold')
-        plt.xlabel('Fecha', fontsize=12)
-        plt.ylabel('Ventas ($)', fontsize=12)
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
+        ax.set_title('Predicción de Ventas (Próximos 5 días)', fontsize=16, fontweight='bold')
+        ax.set_xlabel('Fecha', fontsize=12)
+        ax.set_ylabel('Ventas ($)', fontsize=12)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(axis='x', rotation=45)
         
-        plt.tight_layout()
-        plt.savefig('prediccion_ventas.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self._guardar_figura('prediccion_ventas.png', mostrar)
     
     def generar_reporte_avanzado(self):
         """Generar reporte completo de análisis avanzado"""
-        print("\n" + "="*60)
-        print("🚀 GENERANDO REPORTE AVANZADO DE ANÁLISIS")
-        print("="*60)
+        print(f"\n{SEP60}\n🚀 GENERANDO REPORTE AVANZADO DE ANÁLISIS\n{SEP60}")
         
-        self.analizar_tendencias()
-        self.analizar_estacionalidad()
-        self.analizar_correlaciones()
-        self.analizar_outliers()
-        self.prediccion_simple()
+        if self.modo_streaming:
+            # Los agregados ya están en memoria; no vale la pena releer el archivo en cada proceso
+            for nombre in ANALISIS_REPORTE:
+                getattr(self, _METODOS_ANALISIS[nombre])(mostrar=False)
+        else:
+            # Los cinco análisis son independientes: cada proceso genera su PNG
+            # y devuelve su salida de texto, que se imprime en el orden original
+            archivos = [self.archivo_datos] * len(ANALISIS_REPORTE)
+            dpis = [self.dpi] * len(ANALISIS_REPORTE)
+            with ProcessPoolExecutor(max_workers=len(ANALISIS_REPORTE)) as ex:
+                for salida in ex.map(_run_one, archivos, ANALISIS_REPORTE, dpis):
+                    print(salida, end='')
         
         print("\n✅ Reporte avanzado generado exitosamente!")
         print("📁 Todas las gráficas se han guardado como archivos PNG.")
 
+
+ANALISIS_REPORTE = ['tendencias', 'estacionalidad', 'correlaciones', 'outliers', 'prediccion']
+_METODOS_ANALISIS = {
+    'tendencias': 'analizar_tendencias',
+    'estacionalidad': 'analizar_estacionalidad',
+    'correlaciones': 'analizar_correlaciones',
+    'outliers': 'analizar_outliers',
+    'prediccion': 'prediccion_simple',
+}
+
+
+def _run_one(archivo_datos, nombre, dpi=DPI_GRAFICAS):
+    """Ejecutar un análisis en un proceso hijo y devolver lo que imprime"""
+    # El proceso hijo sólo guarda el PNG; no necesita backend gráfico
+    plt.switch_backend('Agg')
+    # La carga mapea en memoria la caché Arrow que dejó el proceso principal
+    with contextlib.redirect_stdout(io.StringIO()):
+        analizador = AnalizadorAvanzado(archivo_datos, dpi=dpi)
+    
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        getattr(analizador, _METODOS_ANALISIS[nombre])(mostrar=False)
+    return salida.getvalue()
+
+
 def main():
     """Función principal"""
+    # El reporte sólo genera archivos PNG: sin backend gráfico salvo que se
+    # haya elegido uno con MPLBACKEND
+    if 'MPLBACKEND' not in os.environ:
+        matplotlib.use('Agg')
+    
     print("🎯 ANÁLISIS AVANZADO DE VENTAS")
-    print("="*50)
+    print(SEP50)
     
     analizador = AnalizadorAvanzado('datos_ventas.csv')
     analizador.generar_reporte_avanzado()
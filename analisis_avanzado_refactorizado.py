@@ -26,13 +26,14 @@ def main() -> None:
     print("🎯 ANÁLISIS AVANZADO DE VENTAS")
     print("=" * 50)
     
+    analizador = None
     try:
         # Cargar datos
         loader = DataLoader('datos_ventas.csv')
         datos = loader.cargar()
         
-        # Crear analizador avanzado
-        config = ConfiguracionVisualizacion()
+        # Crear analizador avanzado; sólo se guardan PNG, sin mostrar ventanas
+        config = ConfiguracionVisualizacion(backend='Agg')
         analizador = AnalizadorAvanzado(datos, config)
         
         print("\n" + "=" * 60)
@@ -88,8 +89,10 @@ def main() -> None:
         
         if len(outliers) > 0:
             print("\nOutliers encontrados:")
-            for _, row in outliers.iterrows():
-                print(f"  {row['fecha'].strftime('%Y-%m-%d')} - {row['producto']}: ${row['ventas']:.2f}")
+            for fecha, producto, venta in zip(
+                outliers['fecha'].dt.strftime('%Y-%m-%d'), outliers['producto'], outliers['ventas'].to_numpy()
+            ):
+                print(f"  {fecha} - {producto}: ${venta:.2f}")
         
         analizador.graficar_outliers()
         
@@ -99,8 +102,10 @@ def main() -> None:
         print("=" * 50)
         predicciones = analizador.predecir_ventas(dias_futuros=5)
         print("Predicciones para los próximos 5 días:")
-        for _, row in predicciones.iterrows():
-            print(f"  {row['fecha'].strftime('%Y-%m-%d')}: ${row['prediccion']:.2f}")
+        for fecha, prediccion in zip(
+            predicciones['fecha'].dt.strftime('%Y-%m-%d'), predicciones['prediccion'].to_numpy()
+        ):
+            print(f"  {fecha}: ${prediccion:.2f}")
         
         analizador.graficar_predicciones()
         
@@ -116,6 +121,9 @@ def main() -> None:
     except Exception as e:
         logger.error(f"Error inesperado: {e}", exc_info=True)
         print(f"❌ Error inesperado: {e}")
+    finally:
+        if analizador is not None:
+            analizador.cerrar()
 
 
 if __name__ == "__main__":
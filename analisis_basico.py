@@ -6,6 +6,7 @@ Este script utiliza el paquete ventas_analytics para realizar un análisis compl
 
 import logging
 from pathlib import Path
+from typing import Any, Dict, Tuple
 
 from ventas_analytics import (
     DataLoader,
@@ -46,20 +47,17 @@ class AnalizadorVentas:
         self.loader = DataLoader(archivo_datos)
         self.config = config_visualizacion or ConfiguracionVisualizacion()
         self.visualizador = VisualizadorVentas(self.config)
-        self._datos = None
         self._estadisticas = None
     
     def cargar_datos(self) -> None:
         """Cargar datos desde el archivo."""
-        self._datos = self.loader.cargar()
-        self._estadisticas = EstadisticasVentas(self._datos)
+        # EstadisticasVentas es el único dueño del DataFrame; datos lo expone
+        self._estadisticas = EstadisticasVentas(self.loader.cargar())
     
     @property
     def datos(self):
         """Obtener los datos cargados."""
-        if self._datos is None:
-            self.cargar_datos()
-        return self._datos
+        return self.estadisticas.datos
     
     @property
     def estadisticas(self):
@@ -72,31 +70,28 @@ class AnalizadorVentas:
         """Mostrar resumen estadístico en consola."""
         PresentadorReporte.mostrar_resumen_estadistico(self.estadisticas)
     
-    def graficar_ventas_por_categoria(self) -> None:
-        """Crear gráfica de ventas por categoría."""
-        datos = self.estadisticas.obtener_ventas_por_categoria()
-        self.visualizador.graficar_barras(
-            datos=datos,
+    def _grafica_ventas_por_categoria(self) -> Tuple[str, Dict[str, Any]]:
+        """Método del visualizador y argumentos de la gráfica por categoría."""
+        return 'graficar_barras', dict(
+            datos=self.estadisticas.obtener_ventas_por_categoria(),
             titulo='Ventas Totales por Categoría',
             etiqueta_x='Categoría',
             etiqueta_y='Ventas ($)',
             nombre_archivo='ventas_por_categoria.png'
         )
     
-    def graficar_ventas_por_region(self) -> None:
-        """Crear gráfica de ventas por región."""
-        datos = self.estadisticas.obtener_ventas_por_region()
-        self.visualizador.graficar_torta(
-            datos=datos,
+    def _grafica_ventas_por_region(self) -> Tuple[str, Dict[str, Any]]:
+        """Método del visualizador y argumentos de la gráfica por región."""
+        return 'graficar_torta', dict(
+            datos=self.estadisticas.obtener_ventas_por_region(),
             titulo='Distribución de Ventas por Región',
             nombre_archivo='ventas_por_region.png'
         )
     
-    def graficar_evolucion_ventas(self) -> None:
-        """Crear gráfica de evolución de ventas en el tiempo."""
-        datos = self.estadisticas.obtener_evolucion_temporal()
-        self.visualizador.graficar_linea_temporal(
-            datos=datos,
+    def _grafica_evolucion_ventas(self) -> Tuple[str, Dict[str, Any]]:
+        """Método del visualizador y argumentos de la gráfica de evolución."""
+        return 'graficar_linea_temporal', dict(
+            datos=self.estadisticas.obtener_evolucion_temporal(),
             columna_fecha='fecha',
             columna_valor='ventas',
             titulo='Evolución de Ventas Diarias',
@@ -105,11 +100,10 @@ class AnalizadorVentas:
             nombre_archivo='evolucion_ventas.png'
         )
     
-    def graficar_productos_mas_vendidos(self) -> None:
-        """Crear gráfica de productos más vendidos."""
-        datos = self.estadisticas.obtener_productos_mas_vendidos()
-        self.visualizador.graficar_barras(
-            datos=datos,
+    def _grafica_productos_mas_vendidos(self) -> Tuple[str, Dict[str, Any]]:
+        """Método del visualizador y argumentos de la gráfica de productos."""
+        return 'graficar_barras', dict(
+            datos=self.estadisticas.obtener_productos_mas_vendidos(),
             titulo='Productos Más Vendidos (por cantidad)',
             etiqueta_x='Cantidad Vendida',
             etiqueta_y='Producto',
@@ -117,30 +111,71 @@ class AnalizadorVentas:
             orientacion_horizontal=True
         )
     
-    def generar_reporte_completo(self) -> None:
-        """Generar un reporte completo con todas las visualizaciones."""
+    def graficar_ventas_por_categoria(self) -> None:
+        """Crear gráfica de ventas por categoría."""
+        metodo, argumentos = self._grafica_ventas_por_categoria()
+        getattr(self.visualizador, metodo)(**argumentos)
+    
+    def graficar_ventas_por_region(self) -> None:
+        """Crear gráfica de ventas por región."""
+        metodo, argumentos = self._grafica_ventas_por_region()
+        getattr(self.visualizador, metodo)(**argumentos)
+    
+    def graficar_evolucion_ventas(self) -> None:
+        """Crear gráfica de evolución de ventas en el tiempo."""
+        metodo, argumentos = self._grafica_evolucion_ventas()
+        getattr(self.visualizador, metodo)(**argumentos)
+    
+    def graficar_productos_mas_vendidos(self) -> None:
+        """Crear gráfica de productos más vendidos."""
+        metodo, argumentos = self._grafica_productos_mas_vendidos()
+        getattr(self.visualizador, metodo)(**argumentos)
+    
+    def generar_reporte_completo(self, mostrar_graficas: bool = False) -> None:
+        """
+        Generar un reporte completo con todas las visualizaciones.
+        
+        Args:
+            mostrar_graficas: Si es True, muestra las gráficas además de guardarlas;
+                en ese caso se dibujan en este proceso, una tras otra.
+        """
         logger.info("Iniciando generación de reporte completo")
         
         print("\n" + "=" * 60)
         print("🚀 GENERANDO REPORTE COMPLETO DE ANÁLISIS DE VENTAS")
         print("=" * 60)
         
+        # Calcular todas las agregaciones en una sola pasada sobre los datos
+        self.estadisticas.precomputar_todo()
+        
         # Mostrar resumen estadístico
         self.mostrar_resumen_estadistico()
         
         # Generar todas las gráficas
         print("\n📊 Generando visualizaciones...")
         try:
-            self.graficar_ventas_por_categoria()
-            self.graficar_ventas_por_region()
-            self.graficar_evolucion_ventas()
-            self.graficar_productos_mas_vendidos()
+            # Las cuatro gráficas son independientes: cada proceso recibe los datos
+            # ya agregados, dibuja su PNG y devuelve sus registros de log, que se
+            # emiten aquí en el orden original
+            graficas = [
+                self._grafica_ventas_por_categoria(),
+                self._grafica_ventas_por_region(),
+                self._grafica_evolucion_ventas(),
+                self._grafica_productos_mas_vendidos(),
+            ]
+            if mostrar_graficas:
+                for metodo, argumentos in graficas:
+                    getattr(self.visualizador, metodo)(**argumentos, mostrar=True)
+            else:
+                self.visualizador.graficar_lote(graficas)
             
             print("\n✅ Reporte completo generado exitosamente!")
             print(f"📁 Las gráficas se han guardado en: {Path(self.config.directorio_salida).absolute()}")
         except Exception as e:
             logger.error(f"Error al generar visualizaciones: {e}", exc_info=True)
             raise
+        finally:
+            self.visualizador.cerrar()
 
 
 def main() -> None:
@@ -8,17 +8,15 @@ utilizando el paquete ventas_analytics.
 import logging
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-
 from ventas_analytics import (
     DataLoader,
-    EstadisticasVentas,
-    VisualizadorVentas,
     PresentadorReporte,
     AnalizadorAvanzado,
+    CacheResultados,
     ExportadorDatos,
     ConfiguracionVisualizacion
 )
+from ventas_analytics.data import DIAS_SEMANA
 
 # Configurar logging
 logging.basicConfig(
@@ -27,7 +25,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-
 class DashboardVentas:
     """Dashboard interactivo para análisis de ventas."""
     
@@ -40,11 +37,27 @@ class DashboardVentas:
         """
         self.archivo_datos = archivo_datos
         self.loader = DataLoader(archivo_datos)
+        # Agregaciones, regresión y outliers de ejecuciones anteriores sobre el mismo CSV
+        self.cache_resultados = CacheResultados(archivo_datos)
         self.config = ConfiguracionVisualizacion()
-        self.visualizador = VisualizadorVentas(self.config)
+        self._visualizador = None
         self._datos = None
-        self._estadisticas = None
         self._analizador_avanzado = None
+        self._fig_personalizada = None
+        self._ejes_personalizados = None
+        # Acción de cada opción del menú; '0' (salir) se trata aparte en ejecutar()
+        self._menu = {
+            '1': self.resumen_basico,
+            '2': self.analizar_tendencias,
+            '3': self.analizar_estacionalidad,
+            '4': self.analizar_correlaciones,
+            '5': self.detectar_outliers,
+            '6': self.hacer_predicciones,
+            '7': self.reporte_completo_basico,
+            '8': self.reporte_completo_avanzado,
+            '9': self.visualizaciones_personalizadas,
+            '10': self.exportar_datos,
+        }
     
     def _cargar_datos(self):
         """Cargar y preparar datos."""
@@ -52,9 +65,9 @@ class DashboardVentas:
             self._datos = self.loader.cargar()
             # Preparar para análisis avanzado
             if 'dia_semana' not in self._datos.columns:
-                self._datos['dia_semana'] = self._datos['fecha'].dt.day_name()
+                self._datos['dia_semana'] = self._datos['fecha'].dt.day_name().astype(DIAS_SEMANA)
             if 'mes' not in self._datos.columns:
-                self._datos['mes'] = self._datos['fecha'].dt.month
+                self._datos['mes'] = self._datos['fecha'].dt.month.astype('int8')
     
     @property
     def datos(self):
@@ -62,151 +75,168 @@ class DashboardVentas:
         self._cargar_datos()
         return self._datos
     
+    @property
+    def visualizador(self):
+        """Obtener visualizador; se crea (y aplica estilo y paleta) al primer uso."""
+        if self._visualizador is None:
+            # Importarlo carga matplotlib; las opciones de texto no lo necesitan
+            from ventas_analytics import VisualizadorVentas
+            
+            self._visualizador = VisualizadorVentas(self.config)
+        return self._visualizador
+    
     @property
     def estadisticas(self):
-        """Obtener estadísticas."""
-        if self._estadisticas is None:
-            self._estadisticas = EstadisticasVentas(self.datos)
-        return self._estadisticas
+        """Obtener estadísticas (las mismas que usa el analizador avanzado, con su caché)."""
+        return self.analizador_avanzado.estadisticas
     
     @property
     def analizador_avanzado(self):
         """Obtener analizador avanzado."""
         if self._analizador_avanzado is None:
-            self._analizador_avanzado = AnalizadorAvanzado(self.datos, self.config)
+            self._analizador_avanzado = AnalizadorAvanzado(self.datos, self.config, self.cache_resultados)
         return self._analizador_avanzado
     
+    @staticmethod
+    def _encabezado(titulo: str, ancho: int = 50) -> list:
+        """Líneas del encabezado de una sección, para imprimirlas junto al resto."""
+        return ["\n" + "=" * ancho, titulo, "=" * ancho]
+    
     def mostrar_menu(self):
         """Mostrar menú principal."""
-        print("\n" + "=" * 60)
-        print("🎯 DASHBOARD DE ANÁLISIS DE VENTAS")
-        print("=" * 60)
-        print("1. 📊 Resumen estadístico básico")
-        print("2. 📈 Análisis de tendencias")
-        print("3. 📅 Análisis de estacionalidad")
-        print("4. 🔗 Análisis de correlaciones")
-        print("5. 🔍 Detección de outliers")
-        print("6. 🔮 Predicciones")
-        print("7. 📋 Reporte completo básico")
-        print("8. 📋 Reporte completo avanzado")
-        print("9. 🎨 Visualizaciones personalizadas")
-        print("10. 💾 Exportar datos procesados")
-        print("0. 🚪 Salir")
-        print("=" * 60)
+        print("\n".join([
+            *self._encabezado("🎯 DASHBOARD DE ANÁLISIS DE VENTAS", 60),
+            "1. 📊 Resumen estadístico básico",
+            "2. 📈 Análisis de tendencias",
+            "3. 📅 Análisis de estacionalidad",
+            "4. 🔗 Análisis de correlaciones",
+            "5. 🔍 Detección de outliers",
+            "6. 🔮 Predicciones",
+            "7. 📋 Reporte completo básico",
+            "8. 📋 Reporte completo avanzado",
+            "9. 🎨 Visualizaciones personalizadas",
+            "10. 💾 Exportar datos procesados",
+            "0. 🚪 Salir",
+            "=" * 60,
+        ]))
     
     def resumen_basico(self):
         """Mostrar resumen estadístico básico."""
-        print("\n" + "=" * 50)
-        print("📊 RESUMEN ESTADÍSTICO BÁSICO")
-        print("=" * 50)
-        
         resumen = self.estadisticas.obtener_resumen_general()
+        top_productos = self.estadisticas.obtener_ventas_por_producto(top_n=3)
         formatear = PresentadorReporte.formatear_moneda
         
-        print(f"💰 Total de ventas: {formatear(resumen['total_ventas'])}")
-        print(f"📊 Promedio por transacción: {formatear(resumen['promedio_ventas'])}")
-        print(f"⬆️ Venta máxima: {formatear(resumen['venta_maxima'])}")
-        print(f"⬇️ Venta mínima: {formatear(resumen['venta_minima'])}")
-        print(f"📦 Total de productos vendidos: {resumen['total_productos_vendidos']:,}")
-        
-        # Top 3 productos por ventas
-        print("\n🏆 TOP 3 PRODUCTOS POR VENTAS:")
-        top_productos = self.estadisticas.obtener_ventas_por_producto().head(3)
-        for i, (producto, venta) in enumerate(top_productos.items(), 1):
-            print(f"  {i}. {producto}: {formatear(venta)}")
+        lineas = self._encabezado("📊 RESUMEN ESTADÍSTICO BÁSICO")
+        lineas += [
+            f"💰 Total de ventas: {formatear(resumen['total_ventas'])}",
+            f"📊 Promedio por transacción: {formatear(resumen['promedio_ventas'])}",
+            f"⬆️ Venta máxima: {formatear(resumen['venta_maxima'])}",
+            f"⬇️ Venta mínima: {formatear(resumen['venta_minima'])}",
+            f"📦 Total de productos vendidos: {resumen['total_productos_vendidos']:,}",
+            "\n🏆 TOP 3 PRODUCTOS POR VENTAS:",
+        ]
+        lineas += [
+            f"  {i}. {producto}: {formatear(venta)}"
+            for i, (producto, venta) in enumerate(top_productos.items(), 1)
+        ]
+        print("\n".join(lineas))
     
     def analizar_tendencias(self):
         """Análisis de tendencias."""
-        print("\n" + "=" * 50)
-        print("📈 ANÁLISIS DE TENDENCIAS")
-        print("=" * 50)
-        
         tendencia = self.analizador_avanzado.analizar_tendencias()
-        print(f"📊 Pendiente: {tendencia['pendiente']:.2f}")
-        print(f"🔗 R²: {tendencia['r_cuadrado']:.4f}")
-        print(f"📈 Valor p: {tendencia['valor_p']:.4f}")
         
         if tendencia['pendiente'] > 0:
-            print("📈 Tendencia: CRECIENTE")
+            direccion = "📈 Tendencia: CRECIENTE"
         elif tendencia['pendiente'] < 0:
-            print("📉 Tendencia: DECRECIENTE")
+            direccion = "📉 Tendencia: DECRECIENTE"
         else:
-            print("➡️ Tendencia: ESTABLE")
+            direccion = "➡️ Tendencia: ESTABLE"
+        
+        print("\n".join([
+            *self._encabezado("📈 ANÁLISIS DE TENDENCIAS"),
+            f"📊 Pendiente: {tendencia['pendiente']:.2f}",
+            f"🔗 R²: {tendencia['r_cuadrado']:.4f}",
+            f"📈 Valor p: {tendencia['valor_p']:.4f}",
+            direccion,
+        ]))
         
         self.analizador_avanzado.graficar_tendencia(mostrar=True)
     
     def analizar_estacionalidad(self):
         """Análisis de estacionalidad."""
-        print("\n" + "=" * 50)
-        print("📅 ANÁLISIS DE ESTACIONALIDAD")
-        print("=" * 50)
-        
         ventas_dia = self.analizador_avanzado.obtener_ventas_por_dia_semana()
-        print("📅 Ventas por día de la semana:")
-        for dia, venta in ventas_dia.items():
-            print(f"  {dia}: ${venta:,.2f}")
+        
+        lineas = self._encabezado("📅 ANÁLISIS DE ESTACIONALIDAD")
+        lineas.append("📅 Ventas por día de la semana:")
+        lineas += [f"  {dia}: ${venta:,.2f}" for dia, venta in ventas_dia.items()]
+        print("\n".join(lineas))
         
         self.analizador_avanzado.graficar_estacionalidad_semanal(mostrar=True)
     
     def analizar_correlaciones(self):
         """Análisis de correlaciones."""
-        print("\n" + "=" * 50)
-        print("🔗 ANÁLISIS DE CORRELACIONES")
-        print("=" * 50)
-        
         correlaciones = self.analizador_avanzado.analizar_correlaciones()
-        print("Matriz de correlaciones:")
-        print(correlaciones)
+        print("\n".join([
+            *self._encabezado("🔗 ANÁLISIS DE CORRELACIONES"),
+            "Matriz de correlaciones:",
+            str(correlaciones),
+        ]))
         
         self.analizador_avanzado.graficar_correlaciones(mostrar=True)
     
     def detectar_outliers(self):
         """Detección de outliers."""
-        print("\n" + "=" * 50)
-        print("🔍 DETECCIÓN DE OUTLIERS")
-        print("=" * 50)
-        
         outliers, limites = self.analizador_avanzado.detectar_outliers()
-        print(f"📊 Límite inferior: ${limites['limite_inferior']:.2f}")
-        print(f"📊 Límite superior: ${limites['limite_superior']:.2f}")
-        print(f"🔍 Outliers detectados: {len(outliers)}")
         
+        lineas = self._encabezado("🔍 DETECCIÓN DE OUTLIERS")
+        lineas += [
+            f"📊 Límite inferior: ${limites['limite_inferior']:.2f}",
+            f"📊 Límite superior: ${limites['limite_superior']:.2f}",
+            f"🔍 Outliers detectados: {len(outliers)}",
+        ]
         if len(outliers) > 0:
-            print("\n⚠️ Outliers encontrados:")
-            for _, row in outliers.iterrows():
-                print(f"  {row['fecha'].strftime('%Y-%m-%d')} - {row['producto']}: ${row['ventas']:.2f}")
+            lineas.append("\n⚠️ Outliers encontrados:")
+            lineas += [
+                f"  {fecha} - {producto}: ${venta:.2f}"
+                for fecha, producto, venta in zip(
+                    outliers['fecha'].dt.strftime('%Y-%m-%d'), outliers['producto'], outliers['ventas'].to_numpy()
+                )
+            ]
         else:
-            print("✅ No se detectaron outliers")
+            lineas.append("✅ No se detectaron outliers")
+        print("\n".join(lineas))
         
         self.analizador_avanzado.graficar_outliers(mostrar=True)
     
     def hacer_predicciones(self):
         """Realizar predicciones."""
-        print("\n" + "=" * 50)
-        print("🔮 PREDICCIONES")
-        print("=" * 50)
-        
         predicciones = self.analizador_avanzado.predecir_ventas(dias_futuros=5)
-        print("🔮 Predicciones para los próximos 5 días:")
-        for _, row in predicciones.iterrows():
-            print(f"  {row['fecha'].strftime('%Y-%m-%d')}: ${row['prediccion']:.2f}")
+        
+        lineas = self._encabezado("🔮 PREDICCIONES")
+        lineas.append("🔮 Predicciones para los próximos 5 días:")
+        lineas += [
+            f"  {fecha}: ${prediccion:.2f}"
+            for fecha, prediccion in zip(
+                predicciones['fecha'].dt.strftime('%Y-%m-%d'), predicciones['prediccion'].to_numpy()
+            )
+        ]
+        print("\n".join(lineas))
         
         self.analizador_avanzado.graficar_predicciones(mostrar=True)
     
     def reporte_completo_basico(self):
         """Generar reporte completo básico."""
-        print("\n" + "=" * 60)
-        print("📋 GENERANDO REPORTE COMPLETO BÁSICO")
-        print("=" * 60)
+        print("\n".join(self._encabezado("📋 GENERANDO REPORTE COMPLETO BÁSICO", 60)))
         
         PresentadorReporte.mostrar_resumen_estadistico(self.estadisticas)
         print("\n✅ Reporte básico completo generado!")
     
     def reporte_completo_avanzado(self):
         """Generar reporte completo avanzado."""
-        print("\n" + "=" * 60)
-        print("📋 GENERANDO REPORTE COMPLETO AVANZADO")
-        print("=" * 60)
+        print("\n".join(self._encabezado("📋 GENERANDO REPORTE COMPLETO AVANZADO", 60)))
+        
+        # Una sola pasada agrupada sirve a todas las secciones del reporte
+        self.analizador_avanzado.precomputar_todo()
         
         self.resumen_basico()
         self.analizar_tendencias()
@@ -217,14 +247,33 @@ class DashboardVentas:
         
         print("\n✅ Reporte avanzado completo generado!")
     
+    def _preparar_ejes_personalizados(self):
+        """
+        Obtener los cuatro ejes de las visualizaciones personalizadas.
+        
+        La figura 2x2 se crea una vez y se reutiliza limpiando sus ejes; sólo se
+        vuelve a crear si la ventana se cerró.
+        
+        Returns:
+            Tupla (categoría, región, evolución temporal, productos) de ejes vacíos.
+        """
+        import matplotlib.pyplot as plt
+        
+        if self._fig_personalizada is None or not plt.fignum_exists(self._fig_personalizada.number):
+            self._fig_personalizada, ejes = plt.subplots(2, 2, figsize=(15, 10))
+            self._ejes_personalizados = tuple(ejes.flat)
+        else:
+            for ax in self._ejes_personalizados:
+                ax.clear()
+        return self._ejes_personalizados
+    
     def visualizaciones_personalizadas(self):
         """Visualizaciones personalizadas."""
-        print("\n" + "=" * 50)
-        print("🎨 VISUALIZACIONES PERSONALIZADAS")
-        print("=" * 50)
+        import matplotlib.pyplot as plt
         
-        # Crear subplots
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+        print("\n".join(self._encabezado("🎨 VISUALIZACIONES PERSONALIZADAS")))
+        
+        ax1, ax2, ax3, ax4 = self._preparar_ejes_personalizados()
         
         # 1. Ventas por categoría
         ventas_cat = self.estadisticas.obtener_ventas_por_categoria()
@@ -259,19 +308,19 @@ class DashboardVentas:
     
     def exportar_datos(self):
         """Exportar datos procesados."""
-        print("\n" + "=" * 50)
-        print("💾 EXPORTAR DATOS PROCESADOS")
-        print("=" * 50)
+        print("\n".join(self._encabezado("💾 EXPORTAR DATOS PROCESADOS")))
         
         exportador = ExportadorDatos(self.estadisticas)
         ruta = exportador.exportar_excel()
         
-        print(f"✅ Datos exportados a '{ruta}'")
-        print("📊 Hojas incluidas:")
-        print("  - Datos_Originales")
-        print("  - Resumen_Categoria")
-        print("  - Resumen_Region")
-        print("  - Resumen_Producto")
+        print("\n".join([
+            f"✅ Datos exportados a '{ruta}'",
+            "📊 Hojas incluidas:",
+            "  - Datos_Originales",
+            "  - Resumen_Categoria",
+            "  - Resumen_Region",
+            "  - Resumen_Producto",
+        ]))
     
     def ejecutar(self):
         """Ejecutar el dashboard."""
@@ -283,34 +332,24 @@ class DashboardVentas:
             print(f"❌ Error al cargar datos: {e}")
             return
         
+        try:
+            self._bucle_menu()
+        finally:
+            self.cerrar()
+    
+    def _bucle_menu(self):
+        """Mostrar el menú y ejecutar opciones hasta que se elija salir."""
         while True:
             self.mostrar_menu()
             opcion = input("\nSelecciona una opción (0-10): ").strip()
             
             try:
-                if opcion == '1':
-                    self.resumen_basico()
-                elif opcion == '2':
-                    self.analizar_tendencias()
-                elif opcion == '3':
-                    self.analizar_estacionalidad()
-                elif opcion == '4':
-                    self.analizar_correlaciones()
-                elif opcion == '5':
-                    self.detectar_outliers()
-                elif opcion == '6':
-                    self.hacer_predicciones()
-                elif opcion == '7':
-                    self.reporte_completo_basico()
-                elif opcion == '8':
-                    self.reporte_completo_avanzado()
-                elif opcion == '9':
-                    self.visualizaciones_personalizadas()
-                elif opcion == '10':
-                    self.exportar_datos()
-                elif opcion == '0':
+                if opcion == '0':
                     print("\n👋 ¡Gracias por usar el Dashboard de Análisis de Ventas!")
                     break
+                accion = self._menu.get(opcion)
+                if accion is not None:
+                    accion()
                 else:
                     print("❌ Opción no válida. Por favor, selecciona una opción del 0 al 10.")
             except Exception as e:
@@ -318,6 +357,19 @@ class DashboardVentas:
                 print(f"❌ Error: {e}")
             
             input("\nPresiona Enter para continuar...")
+    
+    def cerrar(self):
+        """Cerrar las figuras de los visualizadores y de las vistas personalizadas."""
+        if self._analizador_avanzado is not None:
+            self._analizador_avanzado.cerrar()
+        if self._visualizador is not None:
+            self._visualizador.cerrar()
+        if self._fig_personalizada is not None:
+            import matplotlib.pyplot as plt
+            
+            plt.close(self._fig_personalizada)
+            self._fig_personalizada = None
+            self._ejes_personalizados = None
 
 
 def main():
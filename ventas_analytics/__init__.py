@@ -8,10 +8,10 @@ generar estadísticas, crear visualizaciones y realizar análisis avanzados.
 from ventas_analytics.config import ConfiguracionVisualizacion
 from ventas_analytics.data import DataLoader
 from ventas_analytics.statistics import EstadisticasVentas
-from ventas_analytics.visualization import VisualizadorVentas
 from ventas_analytics.reporting import PresentadorReporte
 from ventas_analytics.advanced import AnalizadorAvanzado
 from ventas_analytics.export import ExportadorDatos
+from ventas_analytics.cache import CacheResultados
 
 __version__ = "1.0.0"
 __all__ = [
@@ -22,8 +22,19 @@ __all__ = [
     "PresentadorReporte",
     "AnalizadorAvanzado",
     "ExportadorDatos",
+    "CacheResultados",
 ]
 
+
+def __getattr__(nombre: str):
+    """Importar VisualizadorVentas (y con él matplotlib) la primera vez que se pide."""
+    if nombre == "VisualizadorVentas":
+        from ventas_analytics.visualization import VisualizadorVentas
+        
+        return VisualizadorVentas
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
 # Configurar logging básico si no está configurado
 import logging
 
@@ -2,18 +2,20 @@
 Módulo para análisis avanzado de ventas (tendencias, correlaciones, predicciones).
 """
 
-from datetime import timedelta
-from typing import Dict, Tuple, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Tuple, Optional
 
 import numpy as np
 import pandas as pd
-from scipy import stats
 
-from ventas_analytics.data import DataLoader
+from ventas_analytics.cache import CacheResultados
+from ventas_analytics.data import DIAS_SEMANA
+from ventas_analytics.kernels import limites_iqr, matriz_correlacion, regresion_lineal
 from ventas_analytics.statistics import EstadisticasVentas
-from ventas_analytics.visualization import VisualizadorVentas
 from ventas_analytics.config import ConfiguracionVisualizacion
 
+if TYPE_CHECKING:
+    from ventas_analytics.visualization import VisualizadorVentas
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -24,7 +26,8 @@ class AnalizadorAvanzado:
     def __init__(
         self,
         datos: pd.DataFrame,
-        config: Optional[ConfiguracionVisualizacion] = None
+        config: Optional[ConfiguracionVisualizacion] = None,
+        cache_resultados: Optional[CacheResultados] = None
     ):
         """
         Inicializar el analizador avanzado.
@@ -32,54 +35,191 @@ class AnalizadorAvanzado:
         Args:
             datos: DataFrame con datos de ventas.
             config: Configuración para visualizaciones.
+            cache_resultados: Caché en disco del CSV del que salen los datos; las
+                agregaciones, la regresión y los outliers se guardan en ella.
         """
-        self.datos = datos.copy()
+        # Copia superficial: sólo se añaden columnas, que no llegan al DataFrame
+        # original, y las columnas existentes se comparten sin duplicar memoria
+        self.datos = datos.copy(deep=False)
         self._preparar_datos_avanzados()
-        self.estadisticas = EstadisticasVentas(self.datos)
-        self.visualizador = VisualizadorVentas(config)
+        self.estadisticas = EstadisticasVentas(self.datos, cache_resultados)
+        self._cache_resultados = cache_resultados
+        # Como en EstadisticasVentas, la caché en disco sólo vale para estos datos
+        self._clave_resultados = (id(self.datos), len(self.datos))
         self.config = config or ConfiguracionVisualizacion()
+        # Todas las gráficas, también las de tendencia y predicción, reutilizan
+        # la figura compartida del visualizador, que se crea al primer uso
+        self._visualizador: Optional['VisualizadorVentas'] = None
+        self._evolucion_cache: Optional[pd.DataFrame] = None
+        self._clave_evolucion: Optional[Tuple[int, int]] = None
+        self._regresion_cache: Optional[Dict[str, float]] = None
+        self._outliers_cache: Dict[str, Tuple[np.ndarray, Dict[str, float]]] = {}
+        self._clave_outliers: Optional[Tuple[int, int]] = None
+        self._fechas: Optional[np.ndarray] = None
+        self._y: Optional[np.ndarray] = None
+    
+    @property
+    def visualizador(self) -> 'VisualizadorVentas':
+        """Visualizador compartido; crearlo aplica estilo y paleta (importa matplotlib y seaborn)."""
+        if self._visualizador is None:
+            # El módulo de visualización carga matplotlib: sólo se importa al graficar
+            from ventas_analytics.visualization import VisualizadorVentas
+            
+            self._visualizador = VisualizadorVentas(self.config)
+        return self._visualizador
+    
+    def cerrar(self) -> None:
+        """Cerrar la figura del visualizador, si llegó a crearse."""
+        if self._visualizador is not None:
+            self._visualizador.cerrar()
+    
+    def _persistido(self, nombre: str, calcular: Callable[[], Any]) -> Any:
+        """
+        Calcular un resultado, o leerlo de la caché en disco si hay una para estos datos.
+        
+        Args:
+            nombre: Nombre del resultado.
+            calcular: Función sin argumentos que lo calcula.
+            
+        Returns:
+            El resultado guardado o recién calculado.
+        """
+        if self._cache_resultados is None or (id(self.datos), len(self.datos)) != self._clave_resultados:
+            return calcular()
+        return self._cache_resultados.obtener(f'avanzado/{nombre}', calcular)
     
     def _preparar_datos_avanzados(self) -> None:
         """Preparar datos con campos adicionales para análisis avanzado."""
         if 'dia_semana' not in self.datos.columns:
-            self.datos['dia_semana'] = self.datos['fecha'].dt.day_name()
+            self.datos['dia_semana'] = self.datos['fecha'].dt.day_name().astype(DIAS_SEMANA)
+        elif self.datos['dia_semana'].dtype != DIAS_SEMANA:
+            self.datos['dia_semana'] = self.datos['dia_semana'].astype(DIAS_SEMANA)
         if 'mes' not in self.datos.columns:
             self.datos['mes'] = self.datos['fecha'].dt.month
     
-    def analizar_tendencias(self) -> Dict[str, float]:
+    @property
+    def ventas_diarias(self) -> pd.DataFrame:
         """
-        Analizar tendencias en las ventas usando regresión lineal.
+        Ventas totales por día, calculadas una sola vez mientras no cambien los datos.
+        
+        La caché se asocia a la identidad y longitud de self.datos, igual que las
+        agregaciones de EstadisticasVentas; reasignar los datos la invalida.
         
         Returns:
-            Diccionario con métricas de tendencia.
+            DataFrame con fecha y ventas diarias totales, ordenado por fecha.
+        """
+        clave = (id(self.datos), len(self.datos))
+        if clave != self._clave_evolucion:
+            if self.estadisticas.datos is not self.datos:
+                self.estadisticas.datos = self.datos
+            # Sale de la caché de EstadisticasVentas si precomputar_todo() ya la llenó
+            self._evolucion_cache = self.estadisticas.obtener_evolucion_temporal()
+            self._fechas = self._evolucion_cache['fecha'].to_numpy()
+            self._y = self._evolucion_cache['ventas'].to_numpy(dtype=np.float64)
+            self._clave_evolucion = clave
+            self._regresion_cache = None
+        return self._evolucion_cache
+    
+    def _serie_diaria(self) -> Tuple[np.ndarray, np.ndarray]:
         """
-        ventas_diarias = self.estadisticas.obtener_evolucion_temporal()
+        Obtener las ventas diarias como arrays contiguos de fechas y valores.
         
-        x = np.arange(len(ventas_diarias))
-        y = ventas_diarias['ventas'].values
+        Se extraen una vez junto con ventas_diarias; regresión, predicciones y
+        gráficas trabajan sobre ellos sin pasar por el DataFrame.
         
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+        Returns:
+            Tupla (fechas ordenadas, ventas diarias en float64).
+        """
+        self.ventas_diarias  # refresca los arrays si los datos cambiaron
+        return self._fechas, self._y
+    
+    def precomputar_todo(self) -> None:
+        """
+        Calcular en una sola pasada agrupada las agregaciones que comparten los análisis.
         
-        resultado = {
-            'pendiente': float(slope),
-            'intercepto': float(intercept),
-            'r_cuadrado': float(r_value ** 2),
-            'valor_p': float(p_value),
-            'error_estandar': float(std_err)
-        }
+        Las sumas por categoría, región, producto y fecha salen del mismo recorrido
+        del DataFrame (ver EstadisticasVentas.precomputar_todo()); tendencias,
+        predicciones y los resúmenes las leen después de la caché.
+        """
+        self.estadisticas.precomputar_todo()
+    
+    def _ajuste_lineal(self) -> Dict[str, float]:
+        """
+        Ajustar la regresión lineal de las ventas diarias, una sola vez por serie.
+        
+        Tendencias, predicciones y sus gráficas comparten este ajuste; se recalcula
+        sólo cuando ventas_diarias cambia.
+        
+        Returns:
+            Diccionario con pendiente, intercepto, R², valor p, error estándar y
+            número de días ajustados. El valor p sólo está si ya se pidió con
+            analizar_tendencias().
+        """
+        _, y = self._serie_diaria()
+        if self._regresion_cache is None:
+            def calcular() -> Dict[str, float]:
+                slope, intercept, r_value, std_err, n = regresion_lineal(y)
+                return {
+                    'pendiente': float(slope),
+                    'intercepto': float(intercept),
+                    'r': float(r_value),
+                    'r_cuadrado': float(r_value ** 2),
+                    'error_estandar': float(std_err),
+                    'n': n,
+                }
+            
+            # Copia: el valor p se añade después y no debe alterar lo guardado en disco
+            self._regresion_cache = dict(self._persistido('regresion', calcular))
+        return self._regresion_cache
+    
+    @staticmethod
+    def _valor_p(r: float, n: int) -> float:
+        """
+        Calcular el valor p del contraste t de la pendiente, como scipy.stats.linregress.
+        
+        Args:
+            r: Coeficiente de correlación del ajuste.
+            n: Número de puntos ajustados.
+            
+        Returns:
+            Valor p bilateral.
+        """
+        if n > 2 and abs(r) < 1:
+            # scipy.stats es de carga lenta y sólo hace falta para este contraste
+            from scipy import stats
+            
+            t = r * np.sqrt((n - 2) / ((1 - r) * (1 + r)))
+            return float(2 * stats.t.sf(abs(t), n - 2))
+        return np.nan if np.isnan(r) else 0.0
+    
+    def analizar_tendencias(self) -> Dict[str, float]:
+        """
+        Analizar tendencias en las ventas usando regresión lineal.
         
-        return resultado
+        Returns:
+            Diccionario con métricas de tendencia.
+        """
+        ajuste = self._ajuste_lineal()
+        # La distribución t de scipy sólo se evalúa aquí; predicciones y gráficas
+        # usan pendiente e intercepto
+        if 'valor_p' not in ajuste:
+            ajuste['valor_p'] = self._persistido(
+                'valor_p', lambda: self._valor_p(ajuste['r'], ajuste['n'])
+            )
+        return {
+            clave: ajuste[clave]
+            for clave in ('pendiente', 'intercepto', 'r_cuadrado', 'valor_p', 'error_estandar')
+        }
     
     def obtener_ventas_por_dia_semana(self) -> pd.Series:
         """
         Obtener ventas agrupadas por día de la semana.
         
         Returns:
-            Series con ventas por día de la semana.
+            Series con ventas por día de la semana, de lunes a domingo.
         """
-        orden_dias = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        ventas_dia = self.datos.groupby('dia_semana')['ventas'].sum()
-        return ventas_dia.reindex([d for d in orden_dias if d in ventas_dia.index])
+        # dia_semana es una categoría ordenada: los grupos salen ya en orden de días
+        return self.datos.groupby('dia_semana', observed=True)['ventas'].sum()
     
     def analizar_correlaciones(self) -> pd.DataFrame:
         """
@@ -88,12 +228,32 @@ class AnalizadorAvanzado:
         Returns:
             DataFrame con matriz de correlaciones.
         """
-        datos_corr = self.datos.copy()
-        datos_corr['categoria_num'] = pd.Categorical(datos_corr['categoria']).codes
-        datos_corr['region_num'] = pd.Categorical(datos_corr['region']).codes
+        # Sólo se extraen las cuatro columnas como arrays, sin copiar el DataFrame
+        columnas = {
+            'ventas': self.datos['ventas'].to_numpy(dtype=np.float64),
+            'cantidad': self.datos['cantidad'].to_numpy(dtype=np.float64),
+            'categoria_num': self._codigos('categoria'),
+            'region_num': self._codigos('region'),
+        }
+        matriz = matriz_correlacion(np.vstack(list(columnas.values())))
+        return pd.DataFrame(matriz, index=list(columnas), columns=list(columnas))
+    
+    def _codigos(self, columna: str) -> np.ndarray:
+        """
+        Obtener los códigos enteros de una columna categórica.
         
-        correlaciones = datos_corr[['ventas', 'cantidad', 'categoria_num', 'region_num']].corr()
-        return correlaciones
+        Args:
+            columna: Nombre de la columna.
+            
+        Returns:
+            Array con el código de cada fila según el orden de sus categorías.
+        """
+        serie = self.datos[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            return serie.cat.codes.to_numpy()
+        # factorize ordenado da los mismos códigos que pd.Categorical sin construir el objeto
+        codigos, _ = pd.factorize(serie, sort=True)
+        return codigos
     
     def detectar_outliers(self, columna: str = 'ventas') -> Tuple[pd.DataFrame, Dict[str, float]]:
         """
@@ -105,17 +265,32 @@ class AnalizadorAvanzado:
         Returns:
             Tupla con (DataFrame de outliers, diccionario con límites).
         """
-        Q1 = self.datos[columna].quantile(0.25)
-        Q3 = self.datos[columna].quantile(0.75)
-        IQR = Q3 - Q1
-        
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+        # Límites e índices se guardan por columna mientras self.datos sea el mismo
+        # DataFrame, como ventas_diarias; el menú y el informe completo los repiten
+        clave = (id(self.datos), len(self.datos))
+        if clave != self._clave_outliers:
+            self._outliers_cache = {}
+            self._clave_outliers = clave
+        if columna not in self._outliers_cache:
+            self._outliers_cache[columna] = self._persistido(
+                f'outliers/{columna}', lambda: self._calcular_outliers(columna)
+            )
+        indices, limites = self._outliers_cache[columna]
+        return self.datos.iloc[indices], dict(limites)
+    
+    def _calcular_outliers(self, columna: str) -> Tuple[np.ndarray, Dict[str, float]]:
+        """
+        Calcular los límites IQR de una columna y las posiciones de sus outliers.
         
-        outliers = self.datos[
-            (self.datos[columna] < lower_bound) | 
-            (self.datos[columna] > upper_bound)
-        ]
+        Args:
+            columna: Nombre de la columna a analizar.
+            
+        Returns:
+            Tupla con (posiciones de los outliers, diccionario con límites).
+        """
+        # Ambos cuartiles y la máscara salen del array de la columna, sin Series intermedias
+        Q1, Q3, lower_bound, upper_bound, mascara = limites_iqr(self.datos[columna].to_numpy())
+        IQR = Q3 - Q1
         
         limites = {
             'Q1': float(Q1),
@@ -125,7 +300,7 @@ class AnalizadorAvanzado:
             'limite_superior': float(upper_bound)
         }
         
-        return outliers, limites
+        return np.flatnonzero(mascara), limites
     
     def predecir_ventas(
         self,
@@ -142,48 +317,36 @@ class AnalizadorAvanzado:
         Returns:
             DataFrame con fechas y predicciones.
         """
-        ventas_diarias = self.estadisticas.obtener_evolucion_temporal()
-        x = np.arange(len(ventas_diarias))
-        y = ventas_diarias['ventas'].values
-        
-        slope, intercept, _, _, _ = stats.linregress(x, y)
-        
-        ultima_fecha = ventas_diarias['fecha'].max()
-        predicciones = []
-        fechas_pred = []
-        
-        for i in range(1, dias_futuros + 1):
-            fecha_pred = ultima_fecha + timedelta(days=i)
-            pred = slope * (len(ventas_diarias) + i - 1) + intercept
-            predicciones.append(max(0, pred))  # No ventas negativas
-            fechas_pred.append(fecha_pred)
+        ajuste = self._ajuste_lineal()
+        indices = np.arange(ajuste['n'], ajuste['n'] + dias_futuros)
+        predicciones = ajuste['pendiente'] * indices + ajuste['intercepto']
         
+        fechas, _ = self._serie_diaria()
+        ultima_fecha = pd.Timestamp(fechas[-1])
         return pd.DataFrame({
-            'fecha': fechas_pred,
-            'prediccion': predicciones
+            'fecha': pd.date_range(ultima_fecha + pd.Timedelta(days=1), periods=dias_futuros, freq='D'),
+            'prediccion': np.maximum(0.0, predicciones)  # No ventas negativas
         })
     
     def graficar_tendencia(self, nombre_archivo: str = 'tendencia_ventas.png', mostrar: bool = False) -> None:
         """Graficar ventas con línea de tendencia."""
-        ventas_diarias = self.estadisticas.obtener_evolucion_temporal()
-        tendencia = self.analizar_tendencias()
+        fechas, y = self._serie_diaria()
+        tendencia = self._ajuste_lineal()
         
-        x = np.arange(len(ventas_diarias))
+        x = np.arange(y.size)
         trend_line = tendencia['pendiente'] * x + tendencia['intercepto']
         
-        import matplotlib.pyplot as plt
-        
-        fig, ax = plt.subplots(figsize=self.config.figsize_wide)
+        fig, ax = self.visualizador.preparar_ejes(self.config.figsize_wide)
         ax.plot(
-            ventas_diarias['fecha'],
-            ventas_diarias['ventas'],
+            fechas,
+            y,
             marker='o',
             linewidth=2,
             markersize=6,
             label='Ventas reales'
         )
         ax.plot(
-            ventas_diarias['fecha'],
+            fechas,
             trend_line,
             'r--',
             linewidth=2,
@@ -194,18 +357,10 @@ class AnalizadorAvanzado:
         ax.set_ylabel('Ventas ($)', fontsize=12)
         ax.legend()
         ax.grid(True, alpha=0.3)
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        
-        from pathlib import Path
-        plt.tight_layout()
-        ruta_completa = Path(self.config.directorio_salida) / nombre_archivo
-        plt.savefig(ruta_completa, dpi=self.config.dpi, bbox_inches='tight')
-        logger.info(f"Gráfica guardada: {ruta_completa}")
+        for etiqueta in ax.xaxis.get_majorticklabels():
+            etiqueta.set(rotation=45, ha='right')
         
-        if mostrar:
-            plt.show()
-        else:
-            plt.close()
+        self.visualizador.guardar_figura(fig, nombre_archivo, mostrar)
     
     def graficar_estacionalidad_semanal(
         self,
@@ -259,15 +414,13 @@ class AnalizadorAvanzado:
         mostrar: bool = False
     ) -> None:
         """Graficar predicciones de ventas."""
-        ventas_diarias = self.estadisticas.obtener_evolucion_temporal()
+        fechas, y = self._serie_diaria()
         predicciones = self.predecir_ventas(dias_futuros)
         
-        import matplotlib.pyplot as plt
-        
-        fig, ax = plt.subplots(figsize=self.config.figsize_wide)
+        fig, ax = self.visualizador.preparar_ejes(self.config.figsize_wide)
         ax.plot(
-            ventas_diarias['fecha'],
-            ventas_diarias['ventas'],
+            fechas,
+            y,
             marker='o',
             linewidth=2,
             markersize=6,
@@ -287,16 +440,8 @@ class AnalizadorAvanzado:
         ax.set_ylabel('Ventas ($)', fontsize=12)
         ax.legend()
         ax.grid(True, alpha=0.3)
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        
-        from pathlib import Path
-        plt.tight_layout()
-        ruta_completa = Path(self.config.directorio_salida) / nombre_archivo
-        plt.savefig(ruta_completa, dpi=self.config.dpi, bbox_inches='tight')
-        logger.info(f"Gráfica guardada: {ruta_completa}")
+        for etiqueta in ax.xaxis.get_majorticklabels():
+            etiqueta.set(rotation=45, ha='right')
         
-        if mostrar:
-            plt.show()
-        else:
-            plt.close()
+        self.visualizador.guardar_figura(fig, nombre_archivo, mostrar)
 
@@ -0,0 +1,129 @@
+"""
+Módulo para conservar en disco, entre ejecuciones, resultados calculados sobre un CSV.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheResultados:
+    """
+    Resultados calculados sobre un archivo de datos, guardados junto a él.
+    
+    Los resultados se asocian a un hash SHA-256 del contenido del archivo: si el
+    CSV cambia, los guardados se descartan y se vuelven a calcular.
+    """
+    
+    TAMANO_LECTURA = 1 << 20
+    
+    def __init__(self, ruta_archivo: str):
+        """
+        Inicializar la caché de resultados.
+        
+        Args:
+            ruta_archivo: Ruta al archivo CSV cuyos resultados se guardan.
+        """
+        self.ruta_archivo = Path(ruta_archivo)
+        self._huella: Optional[str] = None
+        self._resultados: Dict[str, Any] = {}
+    
+    @property
+    def ruta_cache(self) -> Path:
+        """Archivo de resultados, junto al CSV como las cachés Parquet y Arrow."""
+        return self.ruta_archivo.with_suffix('.resultados.pkl')
+    
+    def _cargar(self) -> None:
+        """Calcular la huella del CSV y leer los resultados guardados para ella."""
+        if self._huella is not None:
+            return
+        self._huella = self._calcular_huella()
+        self._resultados = self._leer()
+    
+    def _calcular_huella(self) -> str:
+        """
+        Calcular el hash del contenido del CSV, por bloques para no cargarlo entero.
+        
+        Returns:
+            Los 16 primeros caracteres hexadecimales del SHA-256.
+        """
+        h = hashlib.sha256()
+        with open(self.ruta_archivo, 'rb') as f:
+            for bloque in iter(lambda: f.read(self.TAMANO_LECTURA), b''):
+                h.update(bloque)
+        return h.hexdigest()[:16]
+    
+    def _leer(self) -> Dict[str, Any]:
+        """
+        Leer los resultados de una ejecución anterior sobre el mismo CSV.
+        
+        Returns:
+            Diccionario de resultados, vacío si no hay caché o no corresponde al CSV.
+        """
+        try:
+            with open(self.ruta_cache, 'rb') as f:
+                guardado = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return {}
+        if not isinstance(guardado, dict) or guardado.get('huella') != self._huella:
+            return {}
+        logger.info(f"Resultados reutilizados desde {self.ruta_cache}")
+        return guardado['resultados']
+    
+    def _guardar(self) -> None:
+        """Escribir todos los resultados, sustituyendo el archivo de forma atómica."""
+        ruta_tmp = self.ruta_cache.with_suffix('.tmp')
+        try:
+            with open(ruta_tmp, 'wb') as f:
+                pickle.dump(
+                    {'huella': self._huella, 'resultados': self._resultados},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(ruta_tmp, self.ruta_cache)
+        except OSError as e:
+            # Sin caché en disco el análisis sigue funcionando; sólo se pierde la reutilización
+            logger.warning(f"No se pudo guardar la caché de resultados: {e}")
+    
+    def __contains__(self, clave: str) -> bool:
+        """Indicar si hay un resultado guardado con esa clave para el CSV actual."""
+        self._cargar()
+        return clave in self._resultados
+    
+    def __getitem__(self, clave: str) -> Any:
+        """Obtener un resultado guardado; KeyError si no existe."""
+        self._cargar()
+        return self._resultados[clave]
+    
+    def obtener(self, clave: str, calcular: Callable[[], Any]) -> Any:
+        """
+        Obtener un resultado guardado, o calcularlo y guardarlo si no existe.
+        
+        Args:
+            clave: Nombre del resultado.
+            calcular: Función sin argumentos que calcula el resultado.
+            
+        Returns:
+            El resultado guardado o recién calculado.
+        """
+        self._cargar()
+        if clave not in self._resultados:
+            self._resultados[clave] = calcular()
+            self._guardar()
+        return self._resultados[clave]
+    
+    def actualizar(self, resultados: Dict[str, Any]) -> None:
+        """
+        Guardar varios resultados de una vez, con una sola escritura del archivo.
+        
+        Args:
+            resultados: Diccionario de resultados por clave.
+        """
+        self._cargar()
+        self._resultados.update(resultados)
+        self._guardar()
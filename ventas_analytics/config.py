@@ -8,13 +8,51 @@ from dataclasses import dataclass
 from typing import List, Tuple, Optional
 import warnings
 
-import matplotlib.pyplot as plt
-import seaborn as sns
 import logging
 
 logger = logging.getLogger(__name__)
 warnings.filterwarnings('ignore', category=UserWarning)
 
+_paleta_aplicada = False
+_estilo_aplicado: Optional[str] = None
+
+
+def _aplicar_estilo(nombre: str) -> None:
+    """Aplicar un estilo de matplotlib salvo que sea el último aplicado."""
+    global _estilo_aplicado, _paleta_aplicada
+    if nombre == _estilo_aplicado:
+        return
+    # pyplot sólo se importa al configurar un visualizador, no al cargar el paquete
+    import matplotlib.pyplot as plt
+    
+    try:
+        plt.style.use(nombre)
+    except OSError:
+        logger.warning(f"Estilo {nombre} no disponible, usando estilo por defecto")
+        plt.style.use('default')
+    _estilo_aplicado = nombre
+    # El estilo reemplaza el ciclo de colores, así que la paleta hay que volver a fijarla
+    _paleta_aplicada = False
+
+
+def _aplicar_backend(nombre: str) -> None:
+    """Cambiar el backend de matplotlib si no es ya el pedido."""
+    import matplotlib.pyplot as plt
+    
+    if plt.get_backend().lower() != nombre.lower():
+        plt.switch_backend(nombre)
+
+
+def _aplicar_paleta() -> None:
+    """Fijar la paleta de seaborn si no está fijada sobre el estilo actual."""
+    global _paleta_aplicada
+    if not _paleta_aplicada:
+        # seaborn (y scipy.stats, que carga) sólo se importa al ir a graficar
+        import seaborn as sns
+        
+        sns.set_palette("husl")
+        _paleta_aplicada = True
+
 
 @dataclass
 class ConfiguracionVisualizacion:
@@ -22,21 +60,39 @@ class ConfiguracionVisualizacion:
     figsize_standard: Tuple[int, int] = (10, 6)
     figsize_wide: Tuple[int, int] = (12, 6)
     dpi: int = 300
+    # dpi de las gráficas guardadas con calidad='preview' (borradores, paneles)
+    dpi_preview: int = 90
+    png_compress_level: int = 1
+    # 'png' o 'webp'; WebP se codifica más rápido y ocupa menos que PNG
+    formato: str = 'png'
+    calidad_webp: int = 85
     estilo_plt: str = 'seaborn-v0_8'
     paleta_colores: Optional[List[str]] = None
     directorio_salida: str = "."
+    # 'Agg' genera los PNG sin inicializar ninguna interfaz gráfica; None deja el
+    # backend por defecto, necesario si se van a mostrar ventanas con plt.show()
+    backend: Optional[str] = None
+    # Recortar el PNG al contenido obliga a savefig a dibujar la figura una vez
+    # más para medirla; tight_layout ya ajusta los márgenes, así que sólo hace
+    # falta con etiquetas que se salen de la figura
+    tight_bbox: bool = False
     
     def __post_init__(self) -> None:
         """Inicializar valores por defecto después de la creación."""
         if self.paleta_colores is None:
             self.paleta_colores = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57']
+    
+    def configurar(self) -> None:
+        """
+        Aplicar el estilo de matplotlib y la paleta de seaborn.
         
-        # Configurar estilo de matplotlib
-        try:
-            plt.style.use(self.estilo_plt)
-        except OSError:
-            logger.warning(f"Estilo {self.estilo_plt} no disponible, usando estilo por defecto")
-            plt.style.use('default')
-        
-        sns.set_palette("husl")
+        Modifica el estado global de matplotlib, por eso no se hace al crear la
+        configuración sino cuando se va a graficar. Es idempotente: si el estilo
+        pedido es el último aplicado no se vuelve a aplicar. Si se indicó un
+        backend, se activa antes de crear ninguna figura.
+        """
+        if self.backend is not None:
+            _aplicar_backend(self.backend)
+        _aplicar_estilo(self.estilo_plt)
+        _aplicar_paleta()
 
@@ -4,17 +4,31 @@ Módulo para carga y validación de datos de ventas.
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Días de la semana como categoría ordenada: agrupar usa sus códigos y el
+# resultado ya sale en orden de lunes a domingo
+DIAS_SEMANA = pd.CategoricalDtype(
+    ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'], ordered=True
+)
+
 
 class DataLoader:
     """Clase responsable de cargar y validar datos."""
     
     COLUMNAS_REQUERIDAS = ['fecha', 'producto', 'categoria', 'ventas', 'cantidad', 'region']
+    TIPOS_COLUMNAS = {
+        'ventas': 'float64',
+        'categoria': 'category',
+        'region': 'category',
+        'producto': 'category',
+    }
+    TAMANO_BLOQUE = 500_000
     
     def __init__(self, ruta_archivo: str):
         """
@@ -43,8 +57,14 @@ class DataLoader:
         
         logger.info(f"Cargando datos desde {self.ruta_archivo}")
         
+        datos = self._leer_cache()
+        if datos is not None:
+            self._datos = datos
+            logger.info(f"Datos cargados exitosamente: {len(datos)} registros")
+            return datos
+        
         try:
-            datos = pd.read_csv(self.ruta_archivo)
+            datos = self._leer_csv()
         except pd.errors.EmptyDataError:
             logger.error("El archivo CSV está vacío")
             raise
@@ -54,11 +74,150 @@ class DataLoader:
         
         self._validar_datos(datos)
         datos = self._preprocesar_datos(datos)
+        self._guardar_cache(datos)
         
         self._datos = datos
         logger.info(f"Datos cargados exitosamente: {len(datos)} registros")
         return datos
     
+    @property
+    def ruta_cache(self) -> Path:
+        """Ruta de la caché Parquet que se guarda junto al CSV."""
+        return self.ruta_archivo.with_suffix('.parquet')
+    
+    def _leer_cache(self) -> Optional[pd.DataFrame]:
+        """
+        Leer los datos ya validados y preprocesados desde la caché Parquet.
+        
+        Returns:
+            DataFrame de la caché, o None si no existe, es más antigua que el CSV
+            o no se puede leer.
+        """
+        ruta_cache = self.ruta_cache
+        if not ruta_cache.exists():
+            return None
+        if ruta_cache.stat().st_mtime < self.ruta_archivo.stat().st_mtime:
+            return None
+        
+        try:
+            datos = pd.read_parquet(ruta_cache, engine='pyarrow')
+        except (ImportError, OSError, ValueError) as e:
+            logger.warning(f"No se pudo leer la caché {ruta_cache}: {e}")
+            return None
+        logger.debug(f"Datos leídos desde la caché {ruta_cache}")
+        return datos
+    
+    def _guardar_cache(self, datos: pd.DataFrame) -> None:
+        """
+        Guardar los datos preprocesados en la caché Parquet junto al CSV.
+        
+        Args:
+            datos: DataFrame ya validado y preprocesado.
+        """
+        try:
+            datos.to_parquet(
+                self.ruta_cache, engine='pyarrow', compression='zstd',
+                compression_level=1, index=False
+            )
+        except (ImportError, OSError) as e:
+            logger.warning(f"No se pudo guardar la caché {self.ruta_cache}: {e}")
+    
+    def _leer_csv(self) -> pd.DataFrame:
+        """
+        Leer el CSV con el lector multihilo de pyarrow si está disponible.
+        
+        Los tipos de TIPOS_COLUMNAS y la fecha se aplican ya en la lectura, de modo
+        que el preprocesado no necesita copiar ni reconvertir columnas.
+        
+        Returns:
+            DataFrame con el contenido del archivo.
+            
+        Raises:
+            pd.errors.EmptyDataError: Si el archivo está vacío.
+        """
+        # El motor pyarrow señala un archivo vacío con ParserError; se conserva
+        # el EmptyDataError que documenta cargar()
+        if self.ruta_archivo.stat().st_size == 0:
+            raise pd.errors.EmptyDataError("No columns to parse from file")
+        
+        opciones = self._opciones_lectura()
+        try:
+            return pd.read_csv(self.ruta_archivo, engine='pyarrow', **opciones)
+        except ImportError:
+            logger.debug("pyarrow no disponible; se usa el lector de pandas")
+            return pd.read_csv(self.ruta_archivo, **opciones)
+        except ValueError as e:
+            # Con dtype, el motor pyarrow falla si una columna entera tiene huecos
+            # (p. ej. una cantidad vacía); el lector de pandas la deja en float
+            logger.debug(f"El lector pyarrow falló ({e}); se usa el lector de pandas")
+            return pd.read_csv(self.ruta_archivo, **opciones)
+    
+    def _opciones_lectura(self) -> Dict[str, Any]:
+        """
+        Construir los tipos y columnas de fecha que se pasan a pd.read_csv.
+        
+        Returns:
+            Diccionario con las opciones 'dtype' y 'parse_dates'.
+        """
+        # Sólo se declaran las columnas presentes; las que falten las informa
+        # _validar_datos con su propio mensaje
+        columnas = pd.read_csv(self.ruta_archivo, nrows=0).columns
+        return {
+            'dtype': {c: t for c, t in self.TIPOS_COLUMNAS.items() if c in columnas},
+            'parse_dates': ['fecha'] if 'fecha' in columnas else None,
+        }
+    
+    def cargar_agregados(self, tamano_bloque: int = TAMANO_BLOQUE) -> Dict[str, pd.Series]:
+        """
+        Calcular las sumas de ventas leyendo el CSV por bloques.
+        
+        Pensado para archivos que no caben en memoria: el DataFrame completo nunca
+        se materializa y la memoria usada depende del tamaño del bloque, no del
+        archivo. Cada bloque se valida y preprocesa igual que en cargar().
+        
+        Args:
+            tamano_bloque: Número de filas leídas en cada bloque.
+            
+        Returns:
+            Diccionario con las sumas por 'categoria', 'region', 'producto_cantidad',
+            'producto_ventas' y 'fecha', con las mismas claves que usa
+            EstadisticasVentas.precomputar_todo().
+            
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+            ValueError: Si los datos no tienen el formato correcto.
+            pd.errors.EmptyDataError: Si el archivo está vacío.
+        """
+        if not self.ruta_archivo.exists():
+            raise FileNotFoundError(f"El archivo {self.ruta_archivo} no existe.")
+        
+        logger.info(f"Agregando datos por bloques desde {self.ruta_archivo}")
+        
+        agregaciones = {
+            'categoria': ('categoria', 'ventas'),
+            'region': ('region', 'ventas'),
+            'producto_cantidad': ('producto', 'cantidad'),
+            'producto_ventas': ('producto', 'ventas'),
+            'fecha': ('fecha', 'ventas'),
+        }
+        agregados: Dict[str, pd.Series] = {}
+        registros = 0
+        
+        # El motor pyarrow no admite chunksize; se usa el lector de pandas
+        bloques = pd.read_csv(self.ruta_archivo, chunksize=tamano_bloque, **self._opciones_lectura())
+        for bloque in bloques:
+            self._validar_datos(bloque)
+            bloque = self._preprocesar_datos(bloque)
+            for nombre, (clave, columna) in agregaciones.items():
+                parcial = bloque.groupby(clave, sort=False, observed=True)[columna].sum()
+                if nombre in agregados:
+                    parcial = pd.concat([agregados[nombre], parcial]).groupby(level=0).sum()
+                agregados[nombre] = parcial
+            registros += len(bloque)
+        
+        logger.info(f"Datos agregados exitosamente: {registros} registros")
+        return agregados
+    
     def _validar_datos(self, datos: pd.DataFrame) -> None:
         """
         Validar que los datos tienen el formato correcto.
@@ -87,11 +246,11 @@ class DataLoader:
         if not pd.api.types.is_numeric_dtype(datos['cantidad']):
             raise ValueError("La columna 'cantidad' debe ser numérica")
         
-        # Validar valores negativos
-        if (datos['ventas'] < 0).any():
+        # Validar valores negativos: basta con el mínimo, sin crear máscaras booleanas
+        if datos['ventas'].min() < 0:
             logger.warning("Se encontraron ventas negativas en los datos")
         
-        if (datos['cantidad'] < 0).any():
+        if datos['cantidad'].min() < 0:
             logger.warning("Se encontraron cantidades negativas en los datos")
     
     def _preprocesar_datos(self, datos: pd.DataFrame) -> pd.DataFrame:
@@ -104,18 +263,39 @@ class DataLoader:
         Returns:
             DataFrame preprocesado.
         """
-        datos = datos.copy()
-        
-        # Convertir fecha a datetime
-        datos['fecha'] = pd.to_datetime(datos['fecha'], errors='coerce')
+        # La fecha ya llega como datetime desde la lectura; si alguna no se pudo
+        # interpretar, la columna queda como texto y se convierte aquí
+        fecha = datos['fecha']
+        if not pd.api.types.is_datetime64_any_dtype(fecha):
+            fecha = pd.to_datetime(fecha, errors='coerce', cache=True)
+            datos = datos.assign(fecha=fecha)
         
         # Verificar fechas inválidas
-        fechas_invalidas = datos['fecha'].isna().sum()
+        fecha_valida = fecha.notna().to_numpy()
+        fechas_invalidas = fecha_valida.size - int(fecha_valida.sum())
         if fechas_invalidas > 0:
             logger.warning(f"Se encontraron {fechas_invalidas} fechas inválidas")
         
-        # Eliminar filas con valores críticos faltantes
-        datos = datos.dropna(subset=['ventas', 'cantidad', 'fecha'])
+        # Eliminar filas con valores críticos faltantes con una sola máscara,
+        # sin copiar nada si todas las filas son válidas. El filtrado se copia
+        # para que las asignaciones de abajo no escriban sobre una vista
+        validas = fecha_valida & datos['ventas'].notna().to_numpy() & datos['cantidad'].notna().to_numpy()
+        if not validas.all():
+            datos = datos.loc[validas].copy()
+        
+        # Las cantidades caben en int32 salvo valores fuera de rango, que se conservan en int64.
+        # Si llegaron como float por huecos ya eliminados, también se reducen cuando son enteras
+        cantidad = datos['cantidad']
+        if pd.api.types.is_float_dtype(cantidad) and not cantidad.empty:
+            valores = cantidad.to_numpy()
+            if (np.isfinite(valores) & (valores == np.floor(valores))).all():
+                cantidad = cantidad.astype('int64')
+        if pd.api.types.is_integer_dtype(cantidad) and not cantidad.empty:
+            if cantidad.min() >= -2**31 and cantidad.max() < 2**31:
+                datos = datos.assign(cantidad=cantidad.astype('int32'))
+            else:
+                datos = datos.assign(cantidad=cantidad)
+                logger.warning("La columna 'cantidad' no cabe en int32; se mantiene en int64")
         
         return datos
     
@@ -132,7 +312,7 @@ class DataLoader:
         datos = datos.copy()
         
         # Agregar campos temporales
-        datos['dia_semana'] = datos['fecha'].dt.day_name()
+        datos['dia_semana'] = datos['fecha'].dt.day_name().astype(DIAS_SEMANA)
         datos['mes'] = datos['fecha'].dt.month
         
         return datos
@@ -2,8 +2,10 @@
 Módulo para exportación de datos y reportes.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 import pandas as pd
 
@@ -12,10 +14,23 @@ from ventas_analytics.statistics import EstadisticasVentas
 import logging
 logger = logging.getLogger(__name__)
 
+# xlsxwriter escribe el libro bastante más rápido que openpyxl; es opcional
+MOTOR_EXCEL = 'xlsxwriter' if find_spec('xlsxwriter') is not None else 'openpyxl'
+
 
 class ExportadorDatos:
     """Clase para exportar datos procesados a diferentes formatos."""
     
+    # Hoja de resumen -> (columna de agrupación, agregaciones 'sum', 'mean' o 'count')
+    RESUMENES_EXCEL: Dict[str, Tuple[str, Dict[str, Any]]] = {
+        'Resumen_Categoria': ('categoria', {'ventas': ['sum', 'mean', 'count'], 'cantidad': 'sum'}),
+        'Resumen_Region': ('region', {'ventas': ['sum', 'mean', 'count'], 'cantidad': 'sum'}),
+        'Resumen_Producto': ('producto', {'ventas': ['sum', 'mean'], 'cantidad': 'sum'}),
+    }
+    
+    # Filas de datos que caben en una hoja de Excel (1.048.576 menos la cabecera)
+    LIMITE_FILAS_EXCEL = 1_048_575
+    
     def __init__(self, estadisticas: EstadisticasVentas):
         """
         Inicializar el exportador.
@@ -34,6 +49,10 @@ class ExportadorDatos:
         """
         Exportar datos procesados a Excel.
         
+        Si los datos no caben en una hoja (más de LIMITE_FILAS_EXCEL filas), la
+        hoja Datos_Originales se sustituye por un archivo Parquet con el mismo
+        nombre junto al libro, que sólo contiene los resúmenes.
+        
         Args:
             nombre_archivo: Nombre del archivo Excel.
             directorio: Directorio donde guardar el archivo.
@@ -45,31 +64,58 @@ class ExportadorDatos:
         directorio_path.mkdir(parents=True, exist_ok=True)
         ruta_completa = directorio_path / nombre_archivo
         
-        # Crear resúmenes
-        resumen_categoria = self.datos.groupby('categoria').agg({
-            'ventas': ['sum', 'mean', 'count'],
-            'cantidad': 'sum'
-        }).round(2)
+        # Los resúmenes se calculan en otro hilo mientras se escribe la hoja de datos
+        with ThreadPoolExecutor(max_workers=1) as ejecutor:
+            resumenes = ejecutor.submit(self._resumenes)
+            # Sin la opción constant_memory de xlsxwriter: to_excel escribe columna a
+            # columna y en ese modo cada fila se vuelca al empezar la siguiente, así
+            # que sólo sobrevivirían la primera columna y la última fila
+            with pd.ExcelWriter(ruta_completa, engine=MOTOR_EXCEL) as writer:
+                if len(self.datos) <= self.LIMITE_FILAS_EXCEL:
+                    self.datos.to_excel(writer, sheet_name='Datos_Originales', index=False)
+                else:
+                    ruta_datos = ruta_completa.with_suffix('.parquet')
+                    self.datos.to_parquet(ruta_datos, engine='pyarrow', index=False)
+                    logger.warning(
+                        f"{len(self.datos)} registros no caben en una hoja de Excel; "
+                        f"datos originales guardados en {ruta_datos}"
+                    )
+                for hoja, resumen in resumenes.result().items():
+                    resumen.to_excel(writer, sheet_name=hoja)
         
-        resumen_region = self.datos.groupby('region').agg({
-            'ventas': ['sum', 'mean', 'count'],
-            'cantidad': 'sum'
-        }).round(2)
+        logger.info(f"Datos exportados a: {ruta_completa}")
+        return ruta_completa
+    
+    def _resumenes(self) -> Dict[str, pd.DataFrame]:
+        """
+        Calcular las hojas de resumen de RESUMENES_EXCEL con una sola agrupación.
         
-        resumen_producto = self.datos.groupby('producto').agg({
-            'ventas': ['sum', 'mean'],
-            'cantidad': 'sum'
-        }).round(2)
+        Los datos se agrupan una vez por todas las claves juntas, guardando suma y
+        conteo de cada columna; cada hoja se obtiene sumando ese resultado, mucho
+        más pequeño, y las medias salen de suma / conteo.
         
-        # Exportar a Excel
-        with pd.ExcelWriter(ruta_completa) as writer:
-            self.datos.to_excel(writer, sheet_name='Datos_Originales', index=False)
-            resumen_categoria.to_excel(writer, sheet_name='Resumen_Categoria')
-            resumen_region.to_excel(writer, sheet_name='Resumen_Region')
-            resumen_producto.to_excel(writer, sheet_name='Resumen_Producto')
+        Returns:
+            Diccionario hoja -> DataFrame con el resumen redondeado a dos decimales.
+        """
+        claves = list(dict.fromkeys(clave for clave, _ in self.RESUMENES_EXCEL.values()))
+        columnas = list(dict.fromkeys(
+            columna for _, agregaciones in self.RESUMENES_EXCEL.values() for columna in agregaciones
+        ))
+        base = self.datos.groupby(claves, sort=False, observed=True, dropna=False)[columnas].agg(['sum', 'count'])
         
-        logger.info(f"Datos exportados a: {ruta_completa}")
-        return ruta_completa
+        resumenes = {}
+        for hoja, (clave, agregaciones) in self.RESUMENES_EXCEL.items():
+            # Se mantiene el orden por clave: es el orden de las filas en la hoja
+            parcial = base.groupby(level=clave, observed=True).sum()
+            resumen = {}
+            for columna, funciones in agregaciones.items():
+                for funcion in [funciones] if isinstance(funciones, str) else funciones:
+                    if funcion == 'mean':
+                        resumen[(columna, funcion)] = parcial[(columna, 'sum')] / parcial[(columna, 'count')]
+                    else:
+                        resumen[(columna, funcion)] = parcial[(columna, funcion)]
+            resumenes[hoja] = pd.DataFrame(resumen).round(2)
+        return resumenes
     
     def exportar_csv(
         self,
@@ -90,7 +136,33 @@ class ExportadorDatos:
         directorio_path.mkdir(parents=True, exist_ok=True)
         ruta_completa = directorio_path / nombre_archivo
         
-        self.datos.to_csv(ruta_completa, index=False)
+        try:
+            self._escribir_csv_arrow(ruta_completa)
+        except ImportError:
+            logger.debug("pyarrow no disponible; se usa el escritor de pandas")
+            self.datos.to_csv(ruta_completa, index=False)
         logger.info(f"Datos exportados a: {ruta_completa}")
         return ruta_completa
+    
+    def _escribir_csv_arrow(self, ruta: Path) -> None:
+        """
+        Escribir los datos a CSV con el escritor de pyarrow, que formatea en C++.
+        
+        Args:
+            ruta: Ruta del archivo CSV.
+            
+        Raises:
+            ImportError: Si pyarrow no está instalado.
+        """
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+        
+        tabla = pa.Table.from_pandas(self.datos, preserve_index=False)
+        # Las fechas sin hora se escriben como AAAA-MM-DD, igual que con to_csv
+        for i, campo in enumerate(tabla.schema):
+            if pa.types.is_timestamp(campo.type):
+                fechas = self.datos[campo.name].dropna()
+                if (fechas == fechas.dt.normalize()).all():
+                    tabla = tabla.set_column(i, campo.name, tabla.column(i).cast(pa.date32()))
+        pa_csv.write_csv(tabla, ruta)
 
@@ -0,0 +1,318 @@
+"""
+Núcleos numéricos para las agregaciones de ventas.
+
+Si numba está instalado los bucles se compilan con ``@njit``; si no, se usan
+equivalentes vectorizados de NumPy con el mismo resultado.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba es opcional
+    njit = None
+    prange = range
+
+
+def _groupby_sum_loop(codigos: np.ndarray, valores: np.ndarray, salida: np.ndarray) -> None:
+    """Acumular en salida[codigo] cada valor, ignorando códigos negativos y NaN."""
+    for i in range(codigos.size):
+        v = valores[i]
+        if codigos[i] >= 0 and v == v:
+            salida[codigos[i]] += v
+
+
+def _groupby_sum_numpy(codigos: np.ndarray, valores: np.ndarray, salida: np.ndarray) -> None:
+    """Versión NumPy de _groupby_sum_loop basada en np.bincount."""
+    validos = codigos >= 0
+    if valores.dtype.kind == 'f':
+        validos &= ~np.isnan(valores)
+    sumas = np.bincount(codigos[validos], weights=valores[validos], minlength=salida.size)
+    salida += sumas.astype(salida.dtype)
+
+
+if njit is not None:
+    _groupby_sum_kernel = njit(cache=True)(_groupby_sum_loop)
+else:
+    _groupby_sum_kernel = _groupby_sum_numpy
+
+
+def groupby_sum(codigos: np.ndarray, valores: np.ndarray, n_grupos: int) -> np.ndarray:
+    """
+    Sumar valores por grupo a partir de códigos enteros.
+
+    Args:
+        codigos: Código de grupo de cada fila (como los de pd.factorize; -1 = sin grupo).
+        valores: Valores numéricos a sumar, alineados con codigos.
+        n_grupos: Número de grupos distintos.
+
+    Returns:
+        Array de longitud n_grupos con la suma de cada grupo (float64 o int64).
+    """
+    # Se acumula siempre a 64 bits aunque las columnas vengan reducidas
+    salida = np.zeros(n_grupos, dtype=np.float64 if valores.dtype.kind == 'f' else np.int64)
+    _groupby_sum_kernel(np.ascontiguousarray(codigos, dtype=np.int64),
+                        np.ascontiguousarray(valores), salida)
+    return salida
+
+
+def _resumen_loop(valores: np.ndarray):
+    """Conteo, suma, mínimo, máximo y suma de cuadrados centrada (Welford), sin NaN."""
+    n = 0
+    suma = 0.0
+    minimo = np.inf
+    maximo = -np.inf
+    media = 0.0
+    m2 = 0.0
+    for i in range(valores.size):
+        v = valores[i]
+        if v != v:
+            continue
+        n += 1
+        suma += v
+        if v < minimo:
+            minimo = v
+        if v > maximo:
+            maximo = v
+        delta = v - media
+        media += delta / n
+        m2 += delta * (v - media)
+    return n, suma, minimo, maximo, m2
+
+
+def _resumen_numpy(valores: np.ndarray):
+    """Versión NumPy de _resumen_loop."""
+    v = valores[~np.isnan(valores)]
+    if v.size == 0:
+        return 0, 0.0, np.inf, -np.inf, 0.0
+    return v.size, v.sum(), v.min(), v.max(), ((v - v.mean()) ** 2).sum()
+
+
+if njit is not None:
+    _resumen_kernel = njit(cache=True)(_resumen_loop)
+else:
+    _resumen_kernel = _resumen_numpy
+
+
+def resumen_una_pasada(valores: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """
+    Calcular suma, media, mínimo, máximo y desviación estándar en un recorrido.
+
+    Args:
+        valores: Valores numéricos; los NaN se ignoran.
+
+    Returns:
+        Tupla (suma, media, mínimo, máximo, desviación estándar muestral). Sin
+        valores válidos todo es NaN salvo la suma, que es 0; con uno solo, la
+        desviación es NaN, igual que en pandas.
+    """
+    n, suma, minimo, maximo, m2 = _resumen_kernel(
+        np.ascontiguousarray(valores, dtype=np.float64)
+    )
+    if n == 0:
+        return 0.0, np.nan, np.nan, np.nan, np.nan
+    desviacion = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    return float(suma), float(suma / n), float(minimo), float(maximo), float(desviacion)
+
+
+def _cuartiles(valores: np.ndarray) -> Tuple[float, float]:
+    """
+    Calcular Q1 y Q3 con interpolación lineal seleccionando sólo los rangos necesarios.
+
+    Un único np.partition (O(n)) coloca los cuatro valores vecinos de ambos
+    cuartiles, en lugar de ordenar toda la columna; el resultado coincide con
+    np.quantile y Series.quantile (método 'linear'). Los NaN se ignoran.
+    """
+    v = valores[~np.isnan(valores)]
+    if v.size == 0:
+        return np.nan, np.nan
+    posiciones = (v.size - 1) * np.array([0.25, 0.75])
+    bajos = np.floor(posiciones).astype(np.intp)
+    altos = np.minimum(bajos + 1, v.size - 1)
+    v = np.partition(v, np.unique(np.concatenate([bajos, altos])))
+    a, b = v[bajos], v[altos]
+    t = posiciones - bajos
+    # Misma interpolación que np.quantile, estable también cerca de b
+    cuartiles = np.where(t >= 0.5, b - (b - a) * (1 - t), a + (b - a) * t)
+    return float(cuartiles[0]), float(cuartiles[1])
+
+
+def _iqr_loop(valores: np.ndarray, inferior: float, superior: float) -> np.ndarray:
+    """Máscara de valores fuera de [inferior, superior] (NaN no cuenta)."""
+    mascara = np.empty(valores.size, dtype=np.bool_)
+    for i in prange(valores.size):
+        mascara[i] = valores[i] < inferior or valores[i] > superior
+    return mascara
+
+
+def _iqr_numpy(valores: np.ndarray, inferior: float, superior: float) -> np.ndarray:
+    """Versión NumPy de _iqr_loop."""
+    return (valores < inferior) | (valores > superior)
+
+
+if njit is not None:
+    _iqr_kernel = njit(parallel=True, cache=True)(_iqr_loop)
+else:
+    _iqr_kernel = _iqr_numpy
+
+
+def limites_iqr(valores: np.ndarray) -> Tuple[float, float, float, float, np.ndarray]:
+    """
+    Calcular los límites IQR (1.5 × IQR) y la máscara de outliers.
+
+    Args:
+        valores: Valores numéricos; los NaN no cuentan para los cuartiles ni son outliers.
+
+    Returns:
+        Tupla (Q1, Q3, límite inferior, límite superior, máscara booleana).
+    """
+    valores = np.ascontiguousarray(valores, dtype=np.float64)
+    q1, q3 = _cuartiles(valores)
+    iqr = q3 - q1
+    inferior = q1 - 1.5 * iqr
+    superior = q3 + 1.5 * iqr
+    return q1, q3, inferior, superior, _iqr_kernel(valores, inferior, superior)
+
+
+def _regresion_loop(y: np.ndarray):
+    """Medias y sumas de cuadrados/productos centradas de (i, y[i]) en un recorrido."""
+    media_x = 0.0
+    media_y = 0.0
+    sxx = 0.0
+    syy = 0.0
+    sxy = 0.0
+    for i in range(y.size):
+        dx = i - media_x
+        dy = y[i] - media_y
+        media_x += dx / (i + 1)
+        media_y += dy / (i + 1)
+        sxx += dx * (i - media_x)
+        syy += dy * (y[i] - media_y)
+        sxy += dx * (y[i] - media_y)
+    return media_x, media_y, sxx, syy, sxy
+
+
+def _regresion_numpy(y: np.ndarray):
+    """Versión NumPy de _regresion_loop."""
+    x = np.arange(y.size, dtype=np.float64)
+    dx = x - x.mean()
+    dy = y - y.mean()
+    return x.mean(), y.mean(), dx @ dx, dy @ dy, dx @ dy
+
+
+if njit is not None:
+    _regresion_kernel = njit(cache=True)(_regresion_loop)
+else:
+    _regresion_kernel = _regresion_numpy
+
+
+def regresion_lineal(y: np.ndarray) -> Tuple[float, float, float, float, int]:
+    """
+    Ajustar y = pendiente * i + intercepto sobre los índices 0..n-1 en un recorrido.
+
+    Args:
+        y: Valores de la serie, sin NaN.
+
+    Returns:
+        Tupla (pendiente, intercepto, r, error estándar de la pendiente, n), con
+        los mismos criterios que scipy.stats.linregress.
+
+    Raises:
+        ValueError: Si hay menos de dos valores.
+    """
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    n = y.size
+    if n < 2:
+        raise ValueError("Se necesitan al menos dos valores para la regresión")
+    media_x, media_y, sxx, syy, sxy = _regresion_kernel(y)
+    pendiente = sxy / sxx
+    intercepto = media_y - pendiente * media_x
+    # Con y constante la correlación no está definida (scipy devuelve NaN)
+    r = np.nan if syy == 0.0 else min(1.0, max(-1.0, sxy / np.sqrt(sxx * syy)))
+    error = np.sqrt((1 - r ** 2) * syy / sxx / (n - 2)) if n > 2 else 0.0
+    return float(pendiente), float(intercepto), float(r), float(error), n
+
+
+def matriz_correlacion(variables: np.ndarray) -> np.ndarray:
+    """
+    Calcular la matriz de correlaciones de Pearson sólo con su triángulo superior.
+
+    Cada variable se tipifica una vez y se calcula un producto escalar por pareja
+    distinta; el triángulo inferior se copia por simetría y la diagonal vale 1.
+
+    Args:
+        variables: Array (k, n) con una variable por fila.
+
+    Returns:
+        Matriz (k, k) con las correlaciones, igual que np.corrcoef. Las variables
+        constantes dan NaN, también en la diagonal.
+    """
+    z = np.asarray(variables, dtype=np.float64)
+    z = z - z.mean(axis=1, keepdims=True)
+    normas = np.sqrt(np.einsum('ij,ij->i', z, z))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = z / normas[:, None]
+
+    k = z.shape[0]
+    matriz = np.diag(np.where(normas > 0, 1.0, np.nan))
+    for i, j in zip(*np.triu_indices(k, 1)):
+        matriz[i, j] = matriz[j, i] = np.clip(np.dot(z[i], z[j]), -1.0, 1.0)
+    return matriz
+
+
+def _top_n_loop(valores: np.ndarray, k: int) -> np.ndarray:
+    """Posiciones de los k mayores valores, de mayor a menor, con un búfer ordenado."""
+    mejores = np.empty(k, dtype=np.float64)
+    posiciones = np.empty(k, dtype=np.int64)
+    m = 0
+    for i in range(valores.size):
+        v = valores[i]
+        # Con empates se queda el primero que apareció, como Series.nlargest
+        if v != v or (m == k and v <= mejores[m - 1]):
+            continue
+        j = m if m < k else k - 1
+        while j > 0 and mejores[j - 1] < v:
+            mejores[j] = mejores[j - 1]
+            posiciones[j] = posiciones[j - 1]
+            j -= 1
+        mejores[j] = v
+        posiciones[j] = i
+        if m < k:
+            m += 1
+    return posiciones[:m]
+
+
+def _top_n_numpy(valores: np.ndarray, k: int) -> np.ndarray:
+    """Versión NumPy de _top_n_loop: umbral con np.partition y orden estable de los candidatos."""
+    candidatos = np.flatnonzero(~np.isnan(valores))
+    if candidatos.size > k:
+        umbral = np.partition(valores[candidatos], candidatos.size - k)[candidatos.size - k]
+        # Se incluyen todos los empates con el umbral; el orden estable deja primero los anteriores
+        candidatos = candidatos[valores[candidatos] >= umbral]
+    orden = np.argsort(-valores[candidatos], kind='stable')
+    return candidatos[orden[:k]]
+
+
+if njit is not None:
+    _top_n_kernel = njit(cache=True)(_top_n_loop)
+else:
+    _top_n_kernel = _top_n_numpy
+
+
+def indices_top_n(valores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Obtener las posiciones de los k mayores valores sin ordenar el array entero.
+
+    Args:
+        valores: Valores numéricos; los NaN se descartan.
+        k: Número de posiciones a devolver.
+
+    Returns:
+        Array int64 con las posiciones, de mayor a menor valor; los empates
+        conservan el orden original, igual que Series.nlargest.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    return _top_n_kernel(np.ascontiguousarray(valores, dtype=np.float64), k)
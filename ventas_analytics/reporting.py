@@ -2,8 +2,13 @@
 Módulo para presentación de reportes.
 """
 
+import pandas as pd
+
 from ventas_analytics.statistics import EstadisticasVentas
 
+# Formateador de moneda ya ligado, compartido por los métodos de PresentadorReporte
+_FORMATO_MONEDA = '${:,.2f}'.format
+
 
 class PresentadorReporte:
     """Clase responsable de presentar reportes en formato legible."""
@@ -19,7 +24,21 @@ class PresentadorReporte:
         Returns:
             String formateado como moneda.
         """
-        return f"${valor:,.2f}"
+        return _FORMATO_MONEDA(valor)
+    
+    @staticmethod
+    def formatear_serie_moneda(serie: pd.Series) -> str:
+        """
+        Formatear una serie de importes como líneas "  etiqueta: $valor".
+        
+        Args:
+            serie: Series con los importes, indexada por etiqueta.
+            
+        Returns:
+            Texto con una línea por elemento, listo para imprimir de una vez.
+        """
+        lineas = '  ' + serie.index.astype(str) + ': ' + serie.map(_FORMATO_MONEDA).to_numpy()
+        return '\n'.join(lineas)
     
     @staticmethod
     def mostrar_resumen_estadistico(estadisticas: EstadisticasVentas) -> None:
@@ -48,12 +67,10 @@ class PresentadorReporte:
         # Ventas por categoría
         print("\n📈 VENTAS POR CATEGORÍA:")
         ventas_categoria = estadisticas.obtener_ventas_por_categoria()
-        for categoria, venta in ventas_categoria.items():
-            print(f"  {categoria}: {formatear(venta)}")
+        print(PresentadorReporte.formatear_serie_moneda(ventas_categoria))
         
         # Ventas por región
         print("\n🌍 VENTAS POR REGIÓN:")
         ventas_region = estadisticas.obtener_ventas_por_region()
-        for region, venta in ventas_region.items():
-            print(f"  {region}: {formatear(venta)}")
+        print(PresentadorReporte.formatear_serie_moneda(ventas_region))
 
@@ -2,22 +2,33 @@
 Módulo para cálculo de estadísticas de ventas.
 """
 
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from ventas_analytics.cache import CacheResultados
+from ventas_analytics.kernels import groupby_sum, resumen_una_pasada
+
 
 class EstadisticasVentas:
     """Clase responsable de calcular estadísticas de ventas."""
     
-    def __init__(self, datos: pd.DataFrame):
+    def __init__(self, datos: pd.DataFrame, cache_resultados: Optional[CacheResultados] = None):
         """
         Inicializar el calculador de estadísticas.
         
         Args:
             datos: DataFrame con los datos de ventas.
+            cache_resultados: Caché en disco del CSV del que salen los datos; las
+                agregaciones se guardan en ella para las siguientes ejecuciones.
         """
         self.datos = datos
+        self._agregados: Dict[str, pd.Series] = {}
+        self._clave_agregados: Optional[Tuple[int, int]] = None
+        self._cache_resultados = cache_resultados
+        # La caché en disco sólo vale para el DataFrame leído de ese CSV
+        self._clave_resultados = (id(datos), len(datos))
         self._validar_datos()
     
     def _validar_datos(self) -> None:
@@ -25,6 +36,112 @@ class EstadisticasVentas:
         if self.datos.empty:
             raise ValueError("No hay datos para analizar")
     
+    def _cache_agregados(self) -> Dict[str, pd.Series]:
+        """
+        Obtener la caché de agregaciones, vaciándola si los datos cambiaron.
+        
+        La caché se asocia a la identidad y longitud de self.datos; reasignar
+        los datos o añadirles filas la invalida.
+        
+        Returns:
+            Diccionario de agregaciones calculadas para los datos actuales.
+        """
+        clave = (id(self.datos), len(self.datos))
+        if clave != self._clave_agregados:
+            self._agregados = {}
+            self._clave_agregados = clave
+        return self._agregados
+    
+    def _cache_disco(self) -> Optional[CacheResultados]:
+        """
+        Obtener la caché en disco si self.datos sigue siendo el DataFrame del CSV.
+        
+        Returns:
+            La caché de resultados, o None si no hay o los datos se reasignaron.
+        """
+        if (id(self.datos), len(self.datos)) != self._clave_resultados:
+            return None
+        return self._cache_resultados
+    
+    def _persistido(self, nombre: str, calcular: Callable[[], Any]) -> Any:
+        """
+        Calcular una agregación, o leerla de la caché en disco si hay una para estos datos.
+        
+        Args:
+            nombre: Nombre de la agregación.
+            calcular: Función sin argumentos que la calcula.
+            
+        Returns:
+            La agregación guardada o recién calculada.
+        """
+        disco = self._cache_disco()
+        if disco is None:
+            return calcular()
+        return disco.obtener(f'estadisticas/{nombre}', calcular)
+    
+    def precomputar_todo(self) -> None:
+        """
+        Calcular de una vez las agregaciones por categoría, región, producto y fecha.
+        
+        Se agrupa una sola vez por las cuatro claves y cada agregación se obtiene
+        sumando ese resultado, mucho más pequeño que los datos originales. Los
+        métodos obtener_* devuelven después estos resultados sin volver a recorrer
+        el DataFrame.
+        """
+        disco = self._cache_disco()
+        claves = {
+            nombre: f'estadisticas/{nombre}'
+            for nombre in ('categoria', 'region', 'producto_cantidad', 'producto_ventas', 'fecha')
+        }
+        if disco is not None and all(clave in disco for clave in claves.values()):
+            # Una ejecución anterior sobre el mismo CSV ya las guardó
+            self._cache_agregados().update({nombre: disco[clave] for nombre, clave in claves.items()})
+            return
+        
+        base = self.datos.groupby(
+            ['categoria', 'region', 'producto', 'fecha'], sort=False, observed=True, dropna=False
+        )[['ventas', 'cantidad']].sum()
+        
+        # Categorías, regiones y productos se ordenan por valor al consultarlos,
+        # así que no se ordenan las claves de grupo
+        sin_orden = {'sort': False, 'observed': True}
+        
+        agregados = {
+            'categoria': base.groupby(level='categoria', **sin_orden)['ventas'].sum(),
+            'region': base.groupby(level='region', **sin_orden)['ventas'].sum(),
+            'producto_cantidad': base.groupby(level='producto', **sin_orden)['cantidad'].sum(),
+            'producto_ventas': base.groupby(level='producto', **sin_orden)['ventas'].sum(),
+            # La evolución temporal sí necesita las fechas en orden cronológico
+            'fecha': base.groupby(level='fecha', observed=True)['ventas'].sum(),
+        }
+        self._cache_agregados().update(agregados)
+        if disco is not None:
+            disco.actualizar({claves[nombre]: valor for nombre, valor in agregados.items()})
+    
+    def _sumar_por(self, clave: str, columna: str, nombre: str, ordenar: bool = True) -> pd.Series:
+        """
+        Obtener la suma de una columna agrupada por clave, calculándola sólo una vez.
+        
+        Args:
+            clave: Columna por la que se agrupa.
+            columna: Columna a sumar.
+            nombre: Nombre de la agregación en la caché.
+            ordenar: Si es False, los grupos quedan en orden de aparición; sirve
+                cuando el resultado se va a ordenar por valor de todos modos.
+            
+        Returns:
+            Series con la suma por clave, ordenada por clave si ordenar es True.
+        """
+        cache = self._cache_agregados()
+        if nombre not in cache:
+            def calcular() -> pd.Series:
+                codigos, grupos = pd.factorize(self.datos[clave], sort=ordenar)
+                sumas = groupby_sum(codigos, self.datos[columna].to_numpy(), len(grupos))
+                return pd.Series(sumas, index=pd.Index(grupos, name=clave), name=columna)
+            
+            cache[nombre] = self._persistido(nombre, calcular)
+        return cache[nombre]
+    
     def obtener_resumen_general(self) -> Dict[str, float]:
         """
         Obtener resumen estadístico general.
@@ -32,15 +149,24 @@ class EstadisticasVentas:
         Returns:
             Diccionario con estadísticas clave.
         """
+        # Se trabaja sobre los arrays de las columnas, sin pasar por Series;
+        # suma, media, extremos y desviación salen de un único recorrido de ventas
+        ventas = self.datos['ventas'].to_numpy(dtype=np.float64)
+        cantidad = self.datos['cantidad'].to_numpy()
+        total, promedio, minimo, maximo, desviacion = resumen_una_pasada(ventas)
+        
+        if cantidad.dtype.kind == 'f':
+            cantidad = cantidad[~np.isnan(cantidad)]
+        total_cantidad = int(cantidad.sum(dtype=np.int64 if cantidad.dtype.kind in 'iu' else None))
         return {
-            'total_ventas': float(self.datos['ventas'].sum()),
-            'promedio_ventas': float(self.datos['ventas'].mean()),
-            'mediana_ventas': float(self.datos['ventas'].median()),
-            'venta_maxima': float(self.datos['ventas'].max()),
-            'venta_minima': float(self.datos['ventas'].min()),
-            'desviacion_estandar': float(self.datos['ventas'].std()),
-            'total_productos_vendidos': int(self.datos['cantidad'].sum()),
-            'promedio_cantidad': float(self.datos['cantidad'].mean()),
+            'total_ventas': total,
+            'promedio_ventas': promedio,
+            'mediana_ventas': float(np.nanmedian(ventas)),
+            'venta_maxima': maximo,
+            'venta_minima': minimo,
+            'desviacion_estandar': desviacion,
+            'total_productos_vendidos': total_cantidad,
+            'promedio_cantidad': float(total_cantidad / cantidad.size),
         }
     
     def obtener_ventas_por_categoria(self) -> pd.Series:
@@ -50,7 +176,7 @@ class EstadisticasVentas:
         Returns:
             Series con ventas agrupadas por categoría, ordenadas descendente.
         """
-        return self.datos.groupby('categoria')['ventas'].sum().sort_values(ascending=False)
+        return self._sumar_por('categoria', 'ventas', 'categoria', ordenar=False).sort_values(ascending=False)
     
     def obtener_ventas_por_region(self) -> pd.Series:
         """
@@ -59,7 +185,7 @@ class EstadisticasVentas:
         Returns:
             Series con ventas agrupadas por región, ordenadas descendente.
         """
-        return self.datos.groupby('region')['ventas'].sum().sort_values(ascending=False)
+        return self._sumar_por('region', 'ventas', 'region', ordenar=False).sort_values(ascending=False)
     
     def obtener_productos_mas_vendidos(self, top_n: Optional[int] = None) -> pd.Series:
         """
@@ -71,10 +197,11 @@ class EstadisticasVentas:
         Returns:
             Series con cantidad vendida por producto, ordenada descendente.
         """
-        productos = self.datos.groupby('producto')['cantidad'].sum().sort_values(ascending=False)
+        productos = self._sumar_por('producto', 'cantidad', 'producto_cantidad', ordenar=False)
         if top_n:
-            productos = productos.head(top_n)
-        return productos
+            # nlargest selecciona los top_n sin ordenar todos los productos
+            return productos.nlargest(top_n)
+        return productos.sort_values(ascending=False)
     
     def obtener_evolucion_temporal(self) -> pd.DataFrame:
         """
@@ -83,14 +210,34 @@ class EstadisticasVentas:
         Returns:
             DataFrame con fecha y ventas diarias totales.
         """
-        return self.datos.groupby('fecha')['ventas'].sum().reset_index()
+        cache = self._cache_agregados()
+        fechas = self.datos['fecha']
+        if 'fecha' not in cache and fechas.is_monotonic_increasing:
+            def calcular() -> pd.Series:
+                # Con las fechas ya ordenadas cada día es un tramo contiguo: basta con
+                # localizar dónde empieza cada tramo y sumarlo, sin tabla hash
+                valores = fechas.to_numpy()
+                inicios = np.flatnonzero(np.r_[True, valores[1:] != valores[:-1]])
+                sumas = np.add.reduceat(self.datos['ventas'].to_numpy(), inicios)
+                return pd.Series(
+                    sumas, index=pd.Index(valores[inicios], name='fecha'), name='ventas'
+                )
+            
+            cache['fecha'] = self._persistido('fecha', calcular)
+        return self._sumar_por('fecha', 'ventas', 'fecha').reset_index()
     
-    def obtener_ventas_por_producto(self) -> pd.Series:
+    def obtener_ventas_por_producto(self, top_n: Optional[int] = None) -> pd.Series:
         """
         Calcular ventas totales por producto.
         
+        Args:
+            top_n: Número de productos a retornar. Si es None, retorna todos.
+            
         Returns:
             Series con ventas agrupadas por producto, ordenadas descendente.
         """
-        return self.datos.groupby('producto')['ventas'].sum().sort_values(ascending=False)
+        productos = self._sumar_por('producto', 'ventas', 'producto_ventas', ordenar=False)
+        if top_n:
+            return productos.nlargest(top_n)
+        return productos.sort_values(ascending=False)
 
@@ -2,17 +2,72 @@
 Módulo para generación de visualizaciones de ventas.
 """
 
+import functools
+import hashlib
+import inspect
+import io
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
 
+import matplotlib
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+import numpy as np
 import pandas as pd
 
 from ventas_analytics.config import ConfiguracionVisualizacion
+from ventas_analytics.kernels import indices_top_n
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Gráficas cuyos bytes se conservan para reutilizarlas; se descarta la menos reciente
+MAX_GRAFICAS_EN_CACHE = 16
+
+
+def _con_cache_png(metodo: Callable) -> Callable:
+    """
+    Decorar un método graficar_* para reutilizar el PNG si sus entradas no cambian.
+    
+    Si la misma gráfica (método, argumentos y configuración) ya se dibujó en este
+    visualizador, se escriben los bytes del PNG guardado en lugar de volver a
+    rasterizar. Los datos (Series, DataFrame, arrays) se comparan por contenido,
+    con un hash de sus valores, índice, nombres y tipos: un objeto nuevo con los
+    mismos datos reutiliza la imagen y uno modificado en sitio se vuelve a dibujar.
+    Con mostrar=True siempre se dibuja, porque hay que mostrarla.
+    """
+    firma = inspect.signature(metodo)
+    
+    @functools.wraps(metodo)
+    def envoltura(self: 'VisualizadorVentas', *args: Any, **kwargs: Any) -> None:
+        argumentos = firma.bind(self, *args, **kwargs)
+        argumentos.apply_defaults()
+        if argumentos.arguments['mostrar']:
+            return metodo(self, *args, **kwargs)
+        
+        ruta = self.ruta_salida(argumentos.arguments['nombre_archivo'])
+        clave = self._clave_grafica(metodo.__name__, argumentos.arguments)
+        guardado = self._cache_png.get(ruta)
+        if guardado is not None and guardado[0] == clave:
+            self._cache_png.move_to_end(ruta)
+            self._escribir(ruta, guardado[1])
+            logger.info(f"Gráfica guardada: {ruta}")
+            return None
+        
+        resultado = metodo(self, *args, **kwargs)
+        self._cache_png[ruta] = (clave, self._ultima_imagen)
+        self._cache_png.move_to_end(ruta)
+        while len(self._cache_png) > MAX_GRAFICAS_EN_CACHE:
+            self._cache_png.popitem(last=False)
+        return resultado
+    
+    return envoltura
+
 
 class VisualizadorVentas:
     """Clase responsable de generar visualizaciones de ventas."""
@@ -25,9 +80,287 @@ class VisualizadorVentas:
             config: Configuración para visualizaciones. Si es None, usa configuración por defecto.
         """
         self.config = config or ConfiguracionVisualizacion()
+        self.config.configurar()
         self.directorio_salida = Path(self.config.directorio_salida)
         self.directorio_salida.mkdir(parents=True, exist_ok=True)
+        # Figura compartida por todas las gráficas; se crea en el primer uso
+        self._fig: Optional[plt.Figure] = None
+        self._ax: Optional[plt.Axes] = None
+        # Ruta del PNG -> (clave de sus entradas, bytes); una entrada por archivo,
+        # como mucho MAX_GRAFICAS_EN_CACHE en orden de uso
+        self._cache_png: 'OrderedDict[Path, Tuple[Tuple[Any, ...], bytes]]' = OrderedDict()
+        # (nombre de archivo, formato) -> ruta completa de salida
+        self._rutas: Dict[Tuple[str, str], Path] = {}
+        # Bytes de la última imagen guardada, para la caché de gráficas
+        self._ultima_imagen = b''
+        # Hilo que escribe las imágenes a disco mientras se dibuja la siguiente;
+        # se crea con la primera escritura y cerrar() lo detiene
+        self._escritor: Optional[ThreadPoolExecutor] = None
+        self._escrituras: List[Future] = []
+        # Número de porciones -> separación de cada porción en graficar_torta
+        self._explode_torta: Dict[int, np.ndarray] = {}
+        # Mapa de colores del heatmap, resuelto una sola vez
+        self._cmap_heatmap = matplotlib.colormaps['coolwarm']
+    
+    def _clave_grafica(self, metodo: str, argumentos: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        Calcular la clave de una gráfica a partir de sus entradas.
+        
+        Args:
+            metodo: Nombre del método graficar_*.
+            argumentos: Argumentos del método, con los valores por defecto aplicados.
+            
+        Returns:
+            Tupla con método, configuración, el repr de los argumentos escalares y
+            un hash del contenido de cada Series, DataFrame o array.
+        """
+        partes: List[Any] = [metodo, repr(self.config)]
+        for nombre, valor in argumentos.items():
+            if nombre in ('self', 'mostrar'):
+                continue
+            if isinstance(valor, (pd.Series, pd.DataFrame, np.ndarray)):
+                partes.append((nombre, self._huella_datos(valor)))
+            else:
+                partes.append((nombre, repr(valor)))
+        return tuple(partes)
+    
+    @staticmethod
+    def _huella_datos(datos: Any) -> bytes:
+        """
+        Calcular un hash BLAKE2b del contenido de una Series, DataFrame o array.
+        
+        Los arrays numéricos y de fechas se recorren directamente como bytes; los
+        de objetos o categorías pasan antes por pd.util.hash_array.
+        
+        Args:
+            datos: Series, DataFrame o array de NumPy.
+            
+        Returns:
+            Resumen de 16 bytes de valores, índice, nombres, tipos y forma.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        
+        def agregar(valores: np.ndarray) -> None:
+            h.update(repr((valores.dtype.str, valores.shape)).encode())
+            if valores.dtype.kind in 'biufcmM':
+                h.update(np.ascontiguousarray(valores).view(np.uint8))
+            else:
+                h.update(pd.util.hash_array(np.asarray(valores, dtype=object).ravel()))
+        
+        if isinstance(datos, np.ndarray):
+            agregar(datos)
+            return h.digest()
+        
+        indices = [datos.index] if isinstance(datos, pd.Series) else [datos.index, datos.columns]
+        columnas = [datos] if isinstance(datos, pd.Series) else [datos.iloc[:, i] for i in range(datos.shape[1])]
+        h.update(repr((type(datos).__name__, getattr(datos, 'name', None))).encode())
+        for indice in indices:
+            h.update(repr((indice.names, str(indice.dtype))).encode())
+            if isinstance(indice, pd.RangeIndex):
+                h.update(repr(indice).encode())
+            else:
+                agregar(indice.to_numpy())
+        for columna in columnas:
+            h.update(str(columna.dtype).encode())
+            agregar(columna.to_numpy())
+        return h.digest()
+    
+    def preparar_ejes(self, figsize: Tuple[int, int]) -> Tuple[plt.Figure, plt.Axes]:
+        """
+        Obtener la figura compartida, vacía y con el tamaño pedido.
+        
+        Args:
+            figsize: Tamaño de la figura en pulgadas.
+            
+        Returns:
+            Tupla (figura, ejes) lista para dibujar.
+        """
+        if self._fig is None:
+            self._fig, self._ax = plt.subplots(figsize=figsize)
+            return self._fig, self._ax
+        
+        # Se conserva la figura pero los ejes se crean de nuevo: limpiar los
+        # anteriores arrastraría estado de la gráfica previa (rejilla, aspecto,
+        # marco de la torta, barra de color del heatmap)
+        self._fig.clear()
+        self._ax = self._fig.add_subplot()
+        self._fig.set_size_inches(figsize)
+        return self._fig, self._ax
+    
+    def ruta_salida(self, nombre_archivo: str) -> Path:
+        """
+        Obtener la ruta donde se guarda una gráfica.
+        
+        La ruta se construye una vez por nombre de archivo y formato; las
+        gráficas que se regeneran reutilizan el mismo Path.
+        
+        Args:
+            nombre_archivo: Nombre del archivo pedido.
+            
+        Returns:
+            Path en el directorio de salida; con formato 'webp' la extensión
+            se cambia a .webp.
+        """
+        clave = (nombre_archivo, self.config.formato)
+        ruta = self._rutas.get(clave)
+        if ruta is None:
+            ruta = self.directorio_salida / nombre_archivo
+            if self.config.formato == 'webp':
+                ruta = ruta.with_suffix('.webp')
+            self._rutas[clave] = ruta
+        return ruta
+    
+    def _opciones_formato(self) -> Dict[str, Any]:
+        """Obtener los argumentos de savefig propios del formato configurado."""
+        if self.config.formato == 'webp':
+            # method=0 es el codificador WebP más rápido; WebP no admite metadatos
+            return {'pil_kwargs': {'quality': self.config.calidad_webp, 'method': 0}}
+        # Compresión zlib baja: la codificación PNG domina el tiempo de savefig
+        return {
+            'metadata': {'Software': None},
+            'pil_kwargs': {'compress_level': self.config.png_compress_level},
+        }
+    
+    def guardar_figura(
+        self,
+        fig: plt.Figure,
+        nombre_archivo: str,
+        mostrar: bool,
+        calidad: Literal['preview', 'final'] = 'final'
+    ) -> None:
+        """
+        Guardar la figura como PNG (o WebP) en el directorio de salida.
+        
+        La imagen se codifica aquí y el archivo se escribe en segundo plano; los
+        errores de escritura se lanzan en esperar_escrituras() o cerrar().
+        
+        Args:
+            fig: Figura a guardar.
+            nombre_archivo: Nombre del archivo para guardar.
+            mostrar: Si es True, muestra la gráfica además de guardarla.
+            calidad: 'final' guarda con config.dpi; 'preview' con config.dpi_preview.
+            
+        Raises:
+            ValueError: Si calidad no es 'preview' ni 'final'.
+        """
+        if calidad not in ('preview', 'final'):
+            raise ValueError(f"Calidad no válida: {calidad!r} (debe ser 'preview' o 'final')")
+        fig.tight_layout()
+        ruta_completa = self.ruta_salida(nombre_archivo)
+        buffer = io.BytesIO()
+        fig.savefig(
+            buffer,
+            format=self.config.formato,
+            # Los píxeles (y el coste de codificarlos) crecen con el cuadrado del dpi
+            dpi=self.config.dpi_preview if calidad == 'preview' else self.config.dpi,
+            bbox_inches='tight' if self.config.tight_bbox else None,
+            **self._opciones_formato()
+        )
+        self._ultima_imagen = buffer.getvalue()
+        self._escribir(ruta_completa, self._ultima_imagen)
+        
+        if mostrar:
+            plt.show()
+    
+    def _escribir(self, ruta: Path, contenido: bytes) -> None:
+        """
+        Escribir una imagen a disco en segundo plano.
+        
+        Un único hilo escribe en orden de llegada, así que dos escrituras del
+        mismo archivo no se cruzan y gana la última.
+        
+        Args:
+            ruta: Ruta del archivo.
+            contenido: Bytes de la imagen codificada.
+        """
+        if self._escritor is None:
+            self._escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ventas-png')
+        self._escrituras = [futuro for futuro in self._escrituras if not futuro.done()]
+        self._escrituras.append(self._escritor.submit(ruta.write_bytes, contenido))
+        logger.info(f"Gráfica guardada: {ruta}")
+    
+    def esperar_escrituras(self) -> None:
+        """
+        Esperar a que terminen las escrituras de imágenes pendientes.
+        
+        Raises:
+            OSError: Si alguna imagen no se pudo escribir.
+        """
+        pendientes, self._escrituras = self._escrituras, []
+        wait(pendientes)
+        for futuro in pendientes:
+            futuro.result()
+    
+    def cerrar(self) -> None:
+        """
+        Cerrar la figura compartida y terminar las escrituras pendientes.
+        
+        El visualizador sigue siendo utilizable: la figura y el hilo de escritura
+        se vuelven a crear con la siguiente gráfica.
+        
+        Raises:
+            OSError: Si alguna imagen no se pudo escribir.
+        """
+        try:
+            self.esperar_escrituras()
+        finally:
+            if self._escritor is not None:
+                self._escritor.shutdown(wait=True)
+                self._escritor = None
+            if self._fig is not None:
+                plt.close(self._fig)
+                self._fig = None
+                self._ax = None
+    
+    def graficar_lote(
+        self,
+        tareas: List[Tuple[str, Dict[str, Any]]],
+        procesos: Optional[int] = None
+    ) -> None:
+        """
+        Dibujar varias gráficas independientes en paralelo, cada una en un proceso.
+        
+        Cada proceso crea su propio visualizador con esta configuración y usa el
+        backend Agg, así que las gráficas sólo se guardan, no se muestran. Los
+        registros de log de cada gráfica se reemiten aquí en el orden de tareas.
+        
+        Args:
+            tareas: Lista de (nombre del método graficar_*, argumentos con nombre).
+                Los argumentos deben poder serializarse con pickle.
+            procesos: Número máximo de procesos. Si es None, uno por tarea sin
+                superar el número de CPU.
+        """
+        if not tareas:
+            return
+        # Nada de escrituras en curso al crear los procesos hijos
+        self.esperar_escrituras()
+        procesos = procesos or min(len(tareas), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [
+                ejecutor.submit(_graficar_en_proceso, self.config, metodo, argumentos)
+                for metodo, argumentos in tareas
+            ]
+            for futuro in futuros:
+                for registro in futuro.result():
+                    logging.getLogger(registro.name).handle(registro)
+    
+    @staticmethod
+    def _seleccionar_top_n(datos: pd.Series, top_n: Optional[int]) -> pd.Series:
+        """
+        Quedarse con los top_n mayores valores de la serie, de mayor a menor.
+        
+        Args:
+            datos: Series a recortar.
+            top_n: Número de valores a conservar. Si es None, la serie no cambia.
+            
+        Returns:
+            Series con los top_n mayores valores (los NaN se descartan).
+        """
+        if top_n is None:
+            return datos
+        return datos.iloc[indices_top_n(datos.to_numpy(dtype=float), top_n)]
     
+    @_con_cache_png
     def graficar_barras(
         self,
         datos: pd.Series,
@@ -36,7 +369,9 @@ class VisualizadorVentas:
         etiqueta_y: str,
         nombre_archivo: str,
         orientacion_horizontal: bool = False,
-        mostrar: bool = False
+        mostrar: bool = False,
+        top_n: Optional[int] = None,
+        calidad: Literal['preview', 'final'] = 'final'
     ) -> None:
         """
         Crear gráfica de barras.
@@ -49,15 +384,22 @@ class VisualizadorVentas:
             nombre_archivo: Nombre del archivo para guardar.
             orientacion_horizontal: Si es True, crea barras horizontales.
             mostrar: Si es True, muestra la gráfica además de guardarla.
+            top_n: Si se indica, sólo se grafican los top_n mayores valores, de
+                mayor a menor.
+            calidad: 'final' guarda con config.dpi; 'preview' con config.dpi_preview,
+                mucho más rápido de rasterizar y codificar.
         """
-        fig, ax = plt.subplots(figsize=self.config.figsize_standard)
+        datos = self._seleccionar_top_n(datos, top_n)
+        fig, ax = self.preparar_ejes(self.config.figsize_standard)
+        # matplotlib recibe arrays de NumPy, sin pasar por la indexación de pandas
+        etiquetas, valores = datos.index.to_numpy(), datos.to_numpy()
         
         if orientacion_horizontal:
-            bars = ax.barh(datos.index, datos.values, color=self.config.paleta_colores[0])
-            self._agregar_valores_barras_horizontales(ax, bars)
+            bars = ax.barh(etiquetas, valores, color=self.config.paleta_colores[0])
+            self._agregar_valores_barras_horizontales(ax, bars, valores)
         else:
-            bars = ax.bar(datos.index, datos.values, color=self.config.paleta_colores[0], edgecolor='navy')
-            self._agregar_valores_barras_verticales(ax, bars)
+            bars = ax.bar(etiquetas, valores, color=self.config.paleta_colores[0], edgecolor='navy')
+            self._agregar_valores_barras_verticales(ax, bars, valores)
             plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
         
         ax.set_title(titulo, fontsize=16, fontweight='bold')
@@ -65,48 +407,30 @@ class VisualizadorVentas:
         ax.set_ylabel(etiqueta_y, fontsize=12)
         ax.grid(True, alpha=0.3, axis='y')
         
-        plt.tight_layout()
-        ruta_completa = self.directorio_salida / nombre_archivo
-        plt.savefig(ruta_completa, dpi=self.config.dpi, bbox_inches='tight')
-        logger.info(f"Gráfica guardada: {ruta_completa}")
-        
-        if mostrar:
-            plt.show()
-        else:
-            plt.close()
+        self.guardar_figura(fig, nombre_archivo, mostrar, calidad)
     
-    def _agregar_valores_barras_verticales(self, ax: plt.Axes, bars) -> None:
+    def _agregar_valores_barras_verticales(self, ax: plt.Axes, bars, valores: np.ndarray) -> None:
         """Agregar valores numéricos sobre las barras verticales."""
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.,
-                height + height * 0.01,
-                f'${height:,.0f}',
-                ha='center',
-                va='bottom',
-                fontweight='bold'
-            )
+        # Etiquetas ya formateadas: fmt con llaves exige matplotlib >= 3.7. Se
+        # formatean desde el array graficado (tolist da floats de Python), no
+        # desde bars.datavalues, que entrega escalares de NumPy
+        etiquetas = [f'${valor:,.0f}' for valor in valores.tolist()]
+        ax.bar_label(bars, labels=etiquetas, padding=3, fontweight='bold')
     
-    def _agregar_valores_barras_horizontales(self, ax: plt.Axes, bars) -> None:
+    def _agregar_valores_barras_horizontales(self, ax: plt.Axes, bars, valores: np.ndarray) -> None:
         """Agregar valores numéricos en las barras horizontales."""
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(
-                width + 0.1,
-                bar.get_y() + bar.get_height() / 2,
-                str(int(width)),
-                ha='left',
-                va='center',
-                fontweight='bold'
-            )
+        etiquetas = [f'{valor:.0f}' for valor in valores.tolist()]
+        ax.bar_label(bars, labels=etiquetas, padding=3, fontweight='bold')
     
+    @_con_cache_png
     def graficar_torta(
         self,
         datos: pd.Series,
         titulo: str,
         nombre_archivo: str,
-        mostrar: bool = False
+        mostrar: bool = False,
+        top_n: Optional[int] = None,
+        calidad: Literal['preview', 'final'] = 'final'
     ) -> None:
         """
         Crear gráfica de torta (pie chart).
@@ -116,32 +440,32 @@ class VisualizadorVentas:
             titulo: Título de la gráfica.
             nombre_archivo: Nombre del archivo para guardar.
             mostrar: Si es True, muestra la gráfica además de guardarla.
+            top_n: Si se indica, sólo se grafican los top_n mayores valores, de
+                mayor a menor.
+            calidad: 'final' guarda con config.dpi; 'preview' con config.dpi_preview,
+                mucho más rápido de rasterizar y codificar.
         """
-        fig, ax = plt.subplots(figsize=self.config.figsize_standard)
+        datos = self._seleccionar_top_n(datos, top_n)
+        fig, ax = self.preparar_ejes(self.config.figsize_standard)
         
-        colores = self.config.paleta_colores[:len(datos)]
-        explode = [0.05] * len(datos)
+        n = len(datos)
+        colores = self.config.paleta_colores[:n]
+        if n not in self._explode_torta:
+            self._explode_torta[n] = np.full(n, 0.05)
         
         ax.pie(
-            datos.values,
-            labels=datos.index,
+            datos.to_numpy(),
+            labels=datos.index.to_numpy(),
             autopct='%1.1f%%',
             colors=colores,
             startangle=90,
-            explode=explode
+            explode=self._explode_torta[n]
         )
         ax.set_title(titulo, fontsize=16, fontweight='bold')
         
-        plt.tight_layout()
-        ruta_completa = self.directorio_salida / nombre_archivo
-        plt.savefig(ruta_completa, dpi=self.config.dpi, bbox_inches='tight')
-        logger.info(f"Gráfica guardada: {ruta_completa}")
-        
-        if mostrar:
-            plt.show()
-        else:
-            plt.close()
+        self.guardar_figura(fig, nombre_archivo, mostrar, calidad)
     
+    @_con_cache_png
     def graficar_linea_temporal(
         self,
         datos: pd.DataFrame,
@@ -152,7 +476,8 @@ class VisualizadorVentas:
         etiqueta_y: str,
         nombre_archivo: str,
         mostrar: bool = False,
-        etiquetas_lineas: Optional[list] = None
+        etiquetas_lineas: Optional[list] = None,
+        calidad: Literal['preview', 'final'] = 'final'
     ) -> None:
         """
         Crear gráfica de línea temporal.
@@ -167,32 +492,51 @@ class VisualizadorVentas:
             nombre_archivo: Nombre del archivo para guardar.
             mostrar: Si es True, muestra la gráfica además de guardarla.
             etiquetas_lineas: Lista de etiquetas para múltiples líneas.
+            calidad: 'final' guarda con config.dpi; 'preview' con config.dpi_preview,
+                mucho más rápido de rasterizar y codificar.
         """
-        fig, ax = plt.subplots(figsize=self.config.figsize_wide)
+        fig, ax = self.preparar_ejes(self.config.figsize_wide)
+        fechas = datos[columna_fecha].to_numpy()
+        if np.issubdtype(fechas.dtype, np.datetime64):
+            # Las fechas se pasan a números de matplotlib de una vez y el eje se
+            # marca como de fechas, sin que plot tenga que buscar su conversor
+            fechas = mdates.date2num(fechas)
+            ax.xaxis_date()
         
         if isinstance(columna_valor, str):
             ax.plot(
-                datos[columna_fecha],
-                datos[columna_valor],
+                fechas,
+                datos[columna_valor].to_numpy(),
                 marker='o',
                 linewidth=2,
                 markersize=6,
                 color=self.config.paleta_colores[2]
             )
         else:
-            # Múltiples líneas
-            for i, col in enumerate(columna_valor):
-                label = etiquetas_lineas[i] if etiquetas_lineas else col
-                ax.plot(
-                    datos[columna_fecha],
-                    datos[col],
-                    marker='o',
-                    linewidth=2,
-                    markersize=6,
-                    label=label,
-                    color=self.config.paleta_colores[i % len(self.config.paleta_colores)]
-                )
-            ax.legend()
+            # Múltiples líneas: todas van en una LineCollection y todos los
+            # marcadores en un scatter, dos artistas en lugar de uno por línea
+            valores = datos[list(columna_valor)].to_numpy(dtype=float).T
+            n_lineas, n_puntos = valores.shape
+            colores = [
+                self.config.paleta_colores[i % len(self.config.paleta_colores)]
+                for i in range(n_lineas)
+            ]
+            # Otros tipos de fecha (con zona horaria, objetos date) pasan por el
+            # conversor de unidades del eje, como con plot
+            ax.xaxis.update_units(fechas)
+            x = np.asarray(ax.xaxis.convert_units(fechas), dtype=float)
+            
+            segmentos = np.stack([np.broadcast_to(x, valores.shape), valores], axis=-1)
+            ax.add_collection(LineCollection(segmentos, colors=colores, linewidths=2))
+            ax.scatter(np.tile(x, n_lineas), valores.ravel(), s=36, c=np.repeat(colores, n_puntos), zorder=3)
+            ax.autoscale_view()
+            
+            # La leyenda necesita un artista por línea; se usan líneas vacías
+            leyenda = [
+                Line2D([], [], color=color, marker='o', linewidth=2, markersize=6)
+                for color in colores
+            ]
+            ax.legend(leyenda, etiquetas_lineas or list(columna_valor))
         
         ax.set_title(titulo, fontsize=16, fontweight='bold')
         ax.set_xlabel(etiqueta_x, fontsize=12)
@@ -200,23 +544,17 @@ class VisualizadorVentas:
         ax.grid(True, alpha=0.3)
         plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
         
-        plt.tight_layout()
-        ruta_completa = self.directorio_salida / nombre_archivo
-        plt.savefig(ruta_completa, dpi=self.config.dpi, bbox_inches='tight')
-        logger.info(f"Gráfica guardada: {ruta_completa}")
-        
-        if mostrar:
-            plt.show()
-        else:
-            plt.close()
+        self.guardar_figura(fig, nombre_archivo, mostrar, calidad)
     
+    @_con_cache_png
     def graficar_boxplot(
         self,
         datos: pd.Series,
         titulo: str,
         etiqueta_y: str,
         nombre_archivo: str,
-        mostrar: bool = False
+        mostrar: bool = False,
+        calidad: Literal['preview', 'final'] = 'final'
     ) -> None:
         """
         Crear gráfica de boxplot.
@@ -227,30 +565,26 @@ class VisualizadorVentas:
             etiqueta_y: Etiqueta del eje Y.
             nombre_archivo: Nombre del archivo para guardar.
             mostrar: Si es True, muestra la gráfica además de guardarla.
+            calidad: 'final' guarda con config.dpi; 'preview' con config.dpi_preview,
+                mucho más rápido de rasterizar y codificar.
         """
-        fig, ax = plt.subplots(figsize=self.config.figsize_standard)
+        fig, ax = self.preparar_ejes(self.config.figsize_standard)
         
-        ax.boxplot(datos, patch_artist=True, boxprops=dict(facecolor='lightblue'))
+        ax.boxplot(datos.to_numpy(), patch_artist=True, boxprops=dict(facecolor='lightblue'))
         ax.set_title(titulo, fontsize=16, fontweight='bold')
         ax.set_ylabel(etiqueta_y, fontsize=12)
         ax.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        ruta_completa = self.directorio_salida / nombre_archivo
-        plt.savefig(ruta_completa, dpi=self.config.dpi, bbox_inches='tight')
-        logger.info(f"Gráfica guardada: {ruta_completa}")
-        
-        if mostrar:
-            plt.show()
-        else:
-            plt.close()
+        self.guardar_figura(fig, nombre_archivo, mostrar, calidad)
     
+    @_con_cache_png
     def graficar_heatmap(
         self,
         datos: pd.DataFrame,
         titulo: str,
         nombre_archivo: str,
-        mostrar: bool = False
+        mostrar: bool = False,
+        calidad: Literal['preview', 'final'] = 'final'
     ) -> None:
         """
         Crear mapa de calor (heatmap).
@@ -260,29 +594,93 @@ class VisualizadorVentas:
             titulo: Título de la gráfica.
             nombre_archivo: Nombre del archivo para guardar.
             mostrar: Si es True, muestra la gráfica además de guardarla.
+            calidad: 'final' guarda con config.dpi; 'preview' con config.dpi_preview,
+                mucho más rápido de rasterizar y codificar.
         """
-        import seaborn as sns
+        fig, ax = self.preparar_ejes(self.config.figsize_standard)
         
-        fig, ax = plt.subplots(figsize=self.config.figsize_standard)
-        
-        sns.heatmap(
-            datos,
-            annot=True,
-            cmap='coolwarm',
-            center=0,
-            square=True,
-            linewidths=0.5,
-            ax=ax
+        # Se dibuja con pcolormesh en lugar de seaborn.heatmap: mismo aspecto
+        # (escala centrada en 0, celdas cuadradas, valores anotados) sin
+        # importar seaborn ni preprocesar el DataFrame
+        valores = datos.to_numpy(dtype=float)
+        limite = np.nanmax(np.abs(valores))
+        malla = ax.pcolormesh(
+            valores, cmap=self._cmap_heatmap, vmin=-limite, vmax=limite,
+            edgecolors='w', linewidth=0.5
         )
-        ax.set_title(titulo, fontsize=16, fontweight='bold')
+        fig.colorbar(malla, ax=ax)
         
-        plt.tight_layout()
-        ruta_completa = self.directorio_salida / nombre_archivo
-        plt.savefig(ruta_completa, dpi=self.config.dpi, bbox_inches='tight')
-        logger.info(f"Gráfica guardada: {ruta_completa}")
+        filas, columnas = valores.shape
+        ax.set_xticks(np.arange(columnas) + 0.5, datos.columns.astype(str))
+        ax.set_yticks(np.arange(filas) + 0.5, datos.index.astype(str), va='center')
+        ax.set_xlim(0, columnas)
+        ax.set_ylim(filas, 0)
+        ax.set_aspect('equal')
+        ax.grid(False)
+        ax.tick_params(length=0)
+        for borde in ax.spines.values():
+            borde.set_visible(False)
         
-        if mostrar:
-            plt.show()
-        else:
-            plt.close()
+        # Texto y color de cada celda calculados de una vez; negro sobre los
+        # colores claros y blanco sobre los oscuros, según su luminancia
+        etiquetas = np.char.mod('%.2g', valores)
+        rgb = malla.cmap(malla.norm(valores))[..., :3]
+        lineal = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+        claros = lineal @ np.array([0.2126, 0.7152, 0.0722]) > 0.408
+        for (i, j), etiqueta in np.ndenumerate(etiquetas):
+            if not np.isnan(valores[i, j]):
+                ax.text(
+                    j + 0.5, i + 0.5, etiqueta, ha='center', va='center',
+                    color='.15' if claros[i, j] else 'w'
+                )
+        ax.set_title(titulo, fontsize=16, fontweight='bold')
+        
+        self.guardar_figura(fig, nombre_archivo, mostrar, calidad)
+
+
+class _RecolectorRegistros(logging.Handler):
+    """Handler que guarda los registros de log para reenviarlos a otro proceso."""
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self.registros: List[logging.LogRecord] = []
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        # Se fija el mensaje para que el registro se pueda serializar
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.registros.append(record)
 
+
+def _graficar_en_proceso(
+    config: ConfiguracionVisualizacion,
+    metodo: str,
+    argumentos: Dict[str, Any]
+) -> List[logging.LogRecord]:
+    """
+    Dibujar una gráfica en un proceso hijo.
+    
+    Args:
+        config: Configuración de visualización del proceso principal.
+        metodo: Nombre del método de VisualizadorVentas a llamar.
+        argumentos: Argumentos con nombre para ese método.
+        
+    Returns:
+        Registros de log emitidos al dibujar, para reenviarlos al proceso principal.
+    """
+    matplotlib.use('Agg')  # Sólo se generan archivos PNG
+    
+    raiz = logging.getLogger()
+    recolector = _RecolectorRegistros()
+    raiz.handlers = [recolector]
+    raiz.setLevel(logging.INFO)
+    
+    # VisualizadorVentas aplica estilo y paleta en este proceso aunque no se haya
+    # heredado el estado de matplotlib
+    visualizador = VisualizadorVentas(config)
+    try:
+        getattr(visualizador, metodo)(**argumentos)
+    finally:
+        visualizador.cerrar()
+    return recolector.registros